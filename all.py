@@ -1,40 +1,375 @@
-from time import time
-
-from day01 import Day01
-from day02 import Day02
-from day03 import Day03
-from day04 import Day04
-from day05 import Day05
-from day06 import Day06
-from day07 import Day07
-from day08 import Day08
-from day09 import Day09
-from day10 import Day10
-from day11 import Day11
-from day12 import Day12
-from day13 import Day13
-from day14 import Day14
-from day15 import Day15
-from day16 import Day16
-from day17 import Day17
-from day18 import Day18
-from day19 import Day19
-from day20 import Day20
-from day21 import Day21
-from day22 import Day22
-from day23 import Day23
-from day25 import Day25
-from util import columns
-
-start = time()
-days = [
-    Day01(), Day02(), Day03(), Day04(), Day05(), Day06(), Day07(), Day08(), Day09(), Day10(), Day11(), Day12(), Day13(),
-    Day14(), Day15(), Day16(), Day17(), Day18(), Day19(), Day20(), Day21(), Day22(), Day23(),
-    # Day 24 was partially manually solved, and so is skipped here.
-    Day25(),
-]
-print("+--------+------------+-----------------+------------------------------------------+")
-for day in days:
-    day.check()
-columns(None, "", time() - start, "")
-print("+--------+------------+-----------------+------------------------------------------+")
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass, field, fields
+from io import StringIO
+from pathlib import Path
+from time import process_time, thread_time, time
+from typing import Any
+
+from util import (
+    BACKEND_ENV,
+    BACKENDS,
+    BUDGET_ENV,
+    COUNTERS_ENV,
+    INPUT_CACHE_ENV,
+    MEMORY_ENV,
+    OUTPUT,
+    OVER_BUDGET,
+    PARALLEL_PARTS_ENV,
+    PHASES,
+    PROFILE_DIR_ENV,
+    PROFILE_ENV,
+    PROFILE_TOP_ENV,
+    SKIPPED_DAYS,
+    WORKERS_ENV,
+    PhaseResult,
+    available_days,
+    backend,
+    benchmark,
+    columns,
+    find_regressions,
+    load_day,
+    make_executor,
+    parse_budgets,
+    parse_days,
+    result_cache_key,
+    separator,
+    time_diff_format,
+)
+
+# Kept in step with history.DEFAULT_DATABASE:
+DEFAULT_HISTORY_DATABASE = ".aoc-cache/history.sqlite3"
+
+def children_cpu_time() -> float:
+    """CPU time used by the child processes this one has waited for, like the workers of --budget, --parallel-parts
+    and --workers, which process_time() leaves out."""
+    times = os.times()
+    return times.children_user + times.children_system
+
+def total_cpu_time() -> float:
+    return process_time() + children_cpu_time()
+
+def run_day(day: int) -> tuple[str, float, list[PhaseResult]]:
+    """Runs a single day inside a worker, returning its table rows, the CPU time it used and its phases' results. Only
+    the module for that day is imported by the worker."""
+    # A thread's CPU time is its own (its children's can't be told apart from other threads', so they're added once
+    # the pool finishes), while a process's includes every thread it runs and the children it waited for:
+    cpu_time = thread_time if backend() == "threads" else total_cpu_time
+    cpu_start = cpu_time()
+    output = StringIO()
+    token = OUTPUT.set(output)
+    try:
+        phases = load_day(day)().check(strict=False)
+    finally:
+        OUTPUT.reset(token)
+    return output.getvalue(), cpu_time() - cpu_start, phases
+
+def print_cached(day: int, entry: dict[str, Any]) -> list[PhaseResult]:
+    """Prints the rows of a day that didn't need to run, from the answers and timings of the run that was cached."""
+    durations: dict[str, int] = entry["durations"]
+    # Parts that returned None are cached with a null answer:
+    results: dict[str, str | None] = entry["results"]
+    columns(day, "Setup", durations["Setup"] / 1e9, "cached")
+    phases = [PhaseResult(day, "Setup", durations["Setup"], cached=True)]
+    for phase in ("Part 1", "Part 2"):
+        if phase in results:
+            answer = results[phase]
+            columns(day, phase, durations[phase] / 1e9, f"{answer} (cached)")
+            # Only runs where every answer was right are cached, so the only unchecked answer is a missing one:
+            passed = None if answer is None else True
+            phases.append(PhaseResult(day, phase, durations[phase], answer, passed, cached=True))
+    if all(results.get(phase) is not None for phase in ("Part 1", "Part 2")):
+        columns(day, "Total", sum(durations.values()) / 1e9, "cached")
+    return phases
+
+def write_results(phases: list[PhaseResult], output_format: str) -> None:
+    """Writes every phase's result to stdout as JSON or CSV, for tools that would otherwise have to parse the table."""
+    if output_format == "json":
+        print(json.dumps([asdict(phase) for phase in phases], indent=2))
+    elif output_format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=[phase_field.name for phase_field in fields(PhaseResult)])
+        writer.writeheader()
+        # Counts are the one field that isn't a single value, so they're written as a JSON object:
+        writer.writerows({**asdict(phase), "counts": json.dumps(phase.counts)} for phase in phases)
+
+def run_benchmarks(days: list[int], repeats: int, warmup: int, output: Path) -> dict[str, dict[str, float]]:
+    """Benchmarks each day one at a time (so days don't compete for cores), printing the median of each phase and
+    writing the full statistics as JSON. Returns the medians."""
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for day in days:
+        stats = benchmark(load_day(day), repeats, warmup)
+        for phase in PHASES:
+            phase_stats = stats[phase]
+            spread = (
+                f"min {time_diff_format(phase_stats['min_ns'] / 1e9)}"
+                f" p95 {time_diff_format(phase_stats['p95_ns'] / 1e9)}"
+                f" sd {time_diff_format(phase_stats['stddev_ns'] / 1e9)}"
+            )
+            columns(day, phase, phase_stats["median_ns"] / 1e9, spread)
+        results[str(day)] = stats
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    return {day: {phase: stats["median_ns"] for phase, stats in phases.items()} for day, phases in results.items()}
+
+def argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Runs every solution and prints a table of answers and timings.")
+    parser.add_argument("--days", help="only import and run these days, like 1-10,17 (default: all but day 24)")
+    parser.add_argument("--format", choices=("table", "json", "csv"), default="table", help="JSON and CSV go to stdout, and the table to stderr")
+    parser.add_argument("--parallel", action="store_true", help="spread the days across a process pool")
+    parser.add_argument("--jobs", type=int, default=None, help="workers to use with --parallel")
+    parser.add_argument("--backend", choices=BACKENDS, help="run parallel work on threads or processes (default: auto)")
+    parser.add_argument("--workers", type=int, help="workers for the data-parallel loops inside days (default: 1)")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="time every phase N times and report statistics")
+    parser.add_argument("--warmup", type=int, default=1, help="runs discarded before --benchmark timings are kept")
+    parser.add_argument("--benchmark-output", type=Path, default=Path("benchmark.json"), help="JSON file for --benchmark")
+    parser.add_argument("--save-baseline", type=Path, metavar="PATH", help="write this run's timings as a baseline")
+    parser.add_argument("--compare", type=Path, metavar="PATH", help="fail if any phase is slower than this baseline")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown for --compare (0.1 is 10%%)")
+    parser.add_argument("--noise-floor", type=float, default=0.005, help="slowdowns under this many seconds are ignored")
+    parser.add_argument("--profile", metavar="DAYS", help="write cProfile stats for these days, like 6,20 or 1-10")
+    parser.add_argument("--profile-dir", type=Path, default=Path("profiles"), help="directory for --profile .pstats files")
+    parser.add_argument("--profile-top", type=int, default=5, help="functions listed under each profiled phase")
+    parser.add_argument("--memory", action="store_true", help="trace each phase's peak memory with tracemalloc")
+    parser.add_argument("--counters", action="store_true", help="count how often each day's hot loops run")
+    parser.add_argument("--input-cache", type=Path, metavar="DIR", help="cache each day's parsed input in DIR")
+    parser.add_argument("--budget", metavar="SECONDS", help="stop parts that run longer than this, like 10 or 10,14.2=60")
+    parser.add_argument("--history", action="store_true", help="record this run's timings for history.py to report on")
+    parser.add_argument("--history-database", type=Path, default=DEFAULT_HISTORY_DATABASE, help="SQLite file for --history")
+    parser.add_argument("--parallel-parts", action="store_true", help="run both parts of days with independent parts at once")
+    parser.add_argument("--incremental", action="store_true", help="only run days whose module, util.py or input changed")
+    parser.add_argument("--result-cache", type=Path, default=Path(".aoc-cache/results.json"), help="JSON file for --incremental")
+    return parser
+
+def selected_days(parser: argparse.ArgumentParser, args: argparse.Namespace) -> list[int]:
+    available = available_days()
+    if args.days is None:
+        return [day for day in available if day not in SKIPPED_DAYS]
+    try:
+        days = sorted(parse_days(args.days))
+    except ValueError:
+        parser.error(f"invalid --days '{args.days}', expected days like 1-10,17")
+    missing = [day for day in days if day not in available]
+    if len(missing) > 0:
+        parser.error(f"no solution module for day(s) {', '.join(str(day) for day in missing)}")
+    return days
+
+def check_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Rejects options that can't be used together, before anything runs."""
+    if args.benchmark is not None and args.benchmark < 1:
+        parser.error(f"--benchmark needs at least one run, not {args.benchmark}")
+    if args.benchmark is not None and args.parallel:
+        parser.error("--benchmark runs days one at a time, and cannot be combined with --parallel")
+    if args.benchmark is not None and args.profile is not None:
+        parser.error("--profile distorts timings, and cannot be combined with --benchmark")
+    if args.benchmark is not None and args.memory:
+        parser.error("--memory distorts timings, and cannot be combined with --benchmark")
+    if args.benchmark is not None and args.counters:
+        parser.error("--counters distorts timings, and cannot be combined with --benchmark")
+    if args.budget is not None and (args.benchmark is not None or args.profile is not None or args.memory):
+        parser.error("--budget runs parts in worker processes, and cannot be combined with --benchmark, --profile or --memory")
+    if args.budget is not None:
+        try:
+            parse_budgets(args.budget)
+        except ValueError:
+            parser.error(f"invalid --budget '{args.budget}', expected seconds like 10 or 10,14.2=60,22=30")
+    if args.incremental and (args.benchmark is not None or args.profile is not None or args.memory):
+        parser.error("--incremental skips unchanged days, and cannot be combined with --benchmark, --profile or --memory")
+    if args.incremental and args.compare is not None:
+        parser.error("--incremental reuses old timings for unchanged days, and cannot be combined with --compare")
+
+def export_settings(args: argparse.Namespace) -> None:
+    """Days read these when they're constructed, and worker processes inherit them."""
+    if args.backend is not None:
+        os.environ[BACKEND_ENV] = args.backend
+    if args.workers is not None:
+        os.environ[WORKERS_ENV] = str(args.workers)
+    if args.profile is not None:
+        os.environ[PROFILE_ENV] = args.profile
+        os.environ[PROFILE_DIR_ENV] = str(args.profile_dir)
+        os.environ[PROFILE_TOP_ENV] = str(args.profile_top)
+    if args.memory:
+        os.environ[MEMORY_ENV] = "1"
+    if args.counters:
+        os.environ[COUNTERS_ENV] = "1"
+    if args.input_cache is not None:
+        os.environ[INPUT_CACHE_ENV] = str(args.input_cache)
+    if args.parallel_parts:
+        os.environ[PARALLEL_PARTS_ENV] = "1"
+    if args.budget is not None:
+        os.environ[BUDGET_ENV] = args.budget
+
+def parse_arguments() -> tuple[argparse.Namespace, list[int]]:
+    """Parses and checks the command line, returning it along with the days to run."""
+    parser = argument_parser()
+    args = parser.parse_args()
+    days = selected_days(parser, args)
+    check_arguments(parser, args)
+    export_settings(args)
+    # The backend is only known once it's been exported:
+    if args.parallel and backend() == "threads" and (args.profile is not None or args.memory or args.counters):
+        parser.error("--profile, --memory and --counters can't tell threads apart, so --parallel needs --backend processes with them")
+    # Forking a supervised worker while other threads run a day can copy a lock some thread holds, and hang:
+    if args.parallel and backend() == "threads" and args.budget is not None:
+        parser.error("--budget starts a worker process for every part, which isn't safe from threads, so --parallel needs --backend processes with it")
+    return args, days
+
+@dataclass
+class Run:
+    """Everything a run has recorded so far, for the results, --compare, --history and the exit status."""
+    # With --incremental, where the answers and timings of each day's last successful run are kept, keyed by day:
+    result_cache_path: Path
+    result_cache: dict[str, dict[str, Any]]
+    # With --incremental, the key each day's result is cached under, and the cached results that are still current:
+    keys: dict[int, str | None]
+    cached: dict[int, dict[str, Any]]
+    # Every phase's result, in day order:
+    phases: list[PhaseResult] = field(default_factory=list)
+    # Nanoseconds for each phase, keyed by day then phase:
+    timings: dict[str, dict[str, float]] = field(default_factory=dict)
+    # Days with a part that was stopped for going over its budget, or that got a wrong answer:
+    over_budget: list[int] = field(default_factory=list)
+    wrong: list[int] = field(default_factory=list)
+
+    def record(self, day: int, day_phases: list[PhaseResult]) -> None:
+        self.phases.extend(day_phases)
+        self.timings[str(day)] = {phase.phase: phase.duration_ns for phase in day_phases}
+        results = {phase.phase: phase.answer for phase in day_phases if phase.phase != "Setup"}
+        if OVER_BUDGET in results.values():
+            self.over_budget.append(day)
+            return
+        if any(phase.passed is False for phase in day_phases):
+            self.wrong.append(day)
+            return
+        key = self.keys.get(day)
+        if key is not None:
+            self.result_cache[str(day)] = {"key": key, "durations": self.timings[str(day)], "results": results}
+            # Written after every day, so the days that passed stay cached even if a later one fails:
+            self.result_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.result_cache_path.write_text(json.dumps(self.result_cache, indent=2) + "\n")
+
+    def record_cached(self, day: int) -> None:
+        self.phases.extend(print_cached(day, self.cached[day]))
+        self.timings[str(day)] = dict(self.cached[day]["durations"])
+
+def start_run(args: argparse.Namespace, days: list[int]) -> Run:
+    """With --incremental, loads the result cache and finds the days whose cached results can be reused."""
+    result_cache: dict[str, dict[str, Any]] = {}
+    if args.incremental and args.result_cache.exists():
+        result_cache = json.loads(args.result_cache.read_text())
+    keys = {day: result_cache_key(day) for day in days} if args.incremental else {}
+    cached = {
+        day: result_cache[str(day)]
+        for day, key in keys.items()
+        if key is not None and result_cache.get(str(day), {}).get("key") == key
+    }
+    return Run(args.result_cache, result_cache, keys, cached)
+
+def run_benchmarked(args: argparse.Namespace, days: list[int], run: Run) -> float:
+    """Runs the days for --benchmark, recording each phase's median. Returns the CPU time used."""
+    cpu_start = total_cpu_time()
+    run.timings = run_benchmarks(days, args.benchmark, args.warmup, args.benchmark_output)
+    cpu_total = total_cpu_time() - cpu_start
+    for day_key, medians in run.timings.items():
+        run.phases.extend(PhaseResult(int(day_key), phase, int(median_ns)) for phase, median_ns in medians.items())
+    return cpu_total
+
+def run_parallel(days: list[int], run: Run, jobs: int | None) -> float:
+    """Runs the days that aren't cached across a pool for --parallel. Returns the CPU time summed across workers."""
+    cpu_total = 0.0
+    children_start = children_cpu_time()
+    with make_executor(jobs) as executor:
+        # map() yields in submission order, so the table stays in day order even though days finish out of order:
+        outputs = executor.map(run_day, [day for day in days if day not in run.cached])
+        for day in days:
+            if day in run.cached:
+                run.record_cached(day)
+                continue
+            output, cpu, day_phases = next(outputs)
+            print(output, end="", file=OUTPUT.get())
+            cpu_total += cpu
+            run.record(day, day_phases)
+    # Worker processes report their own children, but threads share this process's:
+    if backend() == "threads":
+        cpu_total += children_cpu_time() - children_start
+    return cpu_total
+
+def run_serial(days: list[int], run: Run) -> float:
+    """Runs the days that aren't cached one after the other. Returns the CPU time used."""
+    cpu_start = total_cpu_time()
+    for day in days:
+        if day in run.cached:
+            run.record_cached(day)
+            continue
+        run.record(day, load_day(day)().check(strict=False))
+    return total_cpu_time() - cpu_start
+
+def write_totals(run: Run, wall_total: float, cpu_total: float, output_format: str) -> None:
+    """Finishes the table with the run's totals, and writes every phase's result in the chosen format."""
+    columns(None, "Wall", wall_total, "")
+    columns(None, "CPU", cpu_total, "")
+    print(separator(), file=OUTPUT.get())
+    run.phases.append(PhaseResult(None, "Wall", int(wall_total * 1e9)))
+    run.phases.append(PhaseResult(None, "CPU", int(cpu_total * 1e9)))
+    write_results(run.phases, output_format)
+
+def record_history(database: Path, phases: list[PhaseResult], kind: str) -> None:
+    from history import record_run  # noqa: PLC0415
+
+    record_run(database, phases, kind)
+
+def check_baseline(args: argparse.Namespace, timings: dict[str, dict[str, float]]) -> None:
+    """Saves the timings as a baseline for --save-baseline, and for --compare, exits non-zero if any phase is slower
+    than the baseline."""
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(json.dumps(timings, indent=2) + "\n")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        regressions = find_regressions(baseline, timings, args.threshold, args.noise_floor * 1e9)
+        if len(regressions) > 0:
+            table = OUTPUT.get()
+            print(f"Slower than {args.compare} by more than {args.threshold:.0%}:", file=table)
+            print(separator(), file=table)
+            for day, phase, baseline_duration, duration in regressions:
+                change = f"{duration / baseline_duration - 1:+.0%} vs {time_diff_format(baseline_duration / 1e9)}"
+                columns(day, phase, duration / 1e9, change)
+            print(separator(), file=table)
+            sys.exit(1)
+
+def check_failures(run: Run) -> None:
+    """Exits non-zero if any day went over its budget or got a wrong answer, after listing them."""
+    table = OUTPUT.get()
+    if len(run.over_budget) > 0:
+        print(f"Over budget: day(s) {', '.join(str(day) for day in run.over_budget)}", file=table)
+    if len(run.wrong) > 0:
+        print(f"Wrong answers: day(s) {', '.join(str(day) for day in run.wrong)}", file=table)
+    if len(run.over_budget) > 0 or len(run.wrong) > 0:
+        sys.exit(1)
+
+def main() -> None:
+    args, days = parse_arguments()
+    run = start_run(args, days)
+
+    # With --format json or csv, stdout is kept for the results, and the table goes to stderr:
+    OUTPUT.set(sys.stdout if args.format == "table" else sys.stderr)
+    start = time()
+    print(separator(), file=OUTPUT.get())
+    if args.benchmark is not None:
+        cpu_total = run_benchmarked(args, days, run)
+    elif args.parallel:
+        cpu_total = run_parallel(days, run, args.jobs)
+    else:
+        cpu_total = run_serial(days, run)
+    write_totals(run, time() - start, cpu_total, args.format)
+    if args.history:
+        record_history(args.history_database, run.phases, "check" if args.benchmark is None else "benchmark")
+
+    check_baseline(args, run.timings)
+    check_failures(run)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import os
+from functools import partial
+from time import perf_counter_ns
+
+from generators import GENERATORS
+from scaling import time_phases
+from util import BACKEND_ENV, WORKERS_ENV, columns, gil_disabled, make_executor, parse_days, separator
+
+# The days with data-parallel loops inside them, which are the ones a backend can speed up on its own:
+INNER_PARALLEL_DAYS = "6,7"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compares the threads and processes backends on generated inputs.")
+    parser.add_argument("--days", default=INNER_PARALLEL_DAYS, help="days to run, like 1-10,17")
+    parser.add_argument("--scale", type=float, default=1, help="input size relative to a real input")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the generated inputs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="threads or processes in each pool")
+    args = parser.parse_args()
+
+    days = sorted(parse_days(args.days))
+    missing = [day for day in days if day not in GENERATORS]
+    if len(missing) > 0:
+        parser.error(f"no input generator for day(s) {', '.join(str(day) for day in missing)}")
+
+    print(f"GIL {'disabled' if gil_disabled() else 'enabled'}, {args.workers} workers")
+    print(separator())
+    # Serial runs first, as the baseline both backends are measured against:
+    for backend, workers in (("serial", 1), ("threads", args.workers), ("processes", args.workers)):
+        os.environ[BACKEND_ENV] = "processes" if backend == "serial" else backend
+        os.environ[WORKERS_ENV] = str(workers)
+        for day in days:
+            _, durations = time_phases(day, args.scale, args.seed)
+            spread = f"part 1 {durations['Part 1'] / 1e6:.1f}ms, part 2 {durations['Part 2'] / 1e6:.1f}ms"
+            columns(day, backend, (durations["Part 1"] + durations["Part 2"]) / 1e9, spread)
+
+        # Then whole days side by side, like all.py --parallel, with the loops inside them left serial. This includes
+        # generating each day's input:
+        os.environ[WORKERS_ENV] = "1"
+        solve = partial(time_phases, scale=args.scale, seed=args.seed)
+        start = perf_counter_ns()
+        if backend == "serial":
+            for day in days:
+                solve(day)
+        else:
+            with make_executor(workers) as executor:
+                list(executor.map(solve, days))
+        columns(None, backend, (perf_counter_ns() - start) / 1e9, f"{len(days)} days side by side")
+    print(separator())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from util import Day, construct, day_class_for, timed_phases
+
+# Set once per worker process by init_worker, so each worker imports the day's module a single time:
+day_class: type[Day] | None = None
+
+def init_worker(day: int, example: bool) -> None:
+    global day_class
+    day_class = day_class_for(day, example)
+
+def solve_file(path: Path) -> dict[str, str | int | None]:
+    """Solves a single input file, returning its answers and phase timings (or the error it caused)."""
+    assert day_class is not None
+    try:
+        durations, results = timed_phases(construct(day_class, path.read_text()))
+    except Exception as error:  # noqa: BLE001
+        # One malformed input shouldn't stop the rest of the batch:
+        return {"input": path.name, "error": f"{type(error).__name__}: {error}"}
+
+    return {
+        "input": path.name,
+        "part1": results["Part 1"],
+        "part2": results["Part 2"],
+        "setup_ns": durations["Setup"],
+        "part1_ns": durations["Part 1"],
+        "part2_ns": durations["Part 2"],
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solves one day for every input file in a directory.")
+    parser.add_argument("day", type=int, help="the day to solve")
+    parser.add_argument("directory", type=Path, help="directory of input files")
+    parser.add_argument("--pattern", default="*.txt", help="glob selecting input files within the directory")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes to use")
+    parser.add_argument("--example", action="store_true", help="use the day's example class (like Day 18's 7x7 grid)")
+    args = parser.parse_args()
+
+    paths = sorted(path for path in args.directory.glob(args.pattern) if path.is_file())
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker, initargs=(args.day, args.example)) as executor:
+        futures = [executor.submit(solve_file, path) for path in paths]
+        # Results are written as each input finishes, rather than after the whole batch:
+        for future in as_completed(futures):
+            sys.stdout.write(json.dumps(future.result()) + "\n")
+            sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from util import Day
 
 
 class Day01(Day):
+    parts_independent = True
+
     def __init__(self) -> None:
         super().__init__(1, 2344935, 27647262)
         list_a: list[int] = []
@@ -4,6 +4,8 @@ from util import Day
 
 
 class Day02(Day):
+    parts_independent = True
+
     def __init__(self) -> None:
         super().__init__(2, 686, 717)
         self.reports: list[list[int]] = []
@@ -4,6 +4,8 @@ from util import Day
 
 
 class Day03(Day):
+    parts_independent = True
+
     def __init__(self) -> None:
         super().__init__(3, 174960292, 56275602)
 
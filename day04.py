@@ -1,40 +1,33 @@
-from util import Day
+from util import Day, Grid
 
 
 class Day04(Day):
+    parts_independent = True
+
     def __init__(self) -> None:
         super().__init__(4, 2557, 1854)
-        self.width = len(self.lines[0])
-        self.height = len(self.lines)
-
-    def get_char(self, x: int, y: int) -> str:
-        if x >= self.width or x < 0:
-            return ""
-        if y >= self.height or y < 0:
-            return ""
-        return self.lines[y][x]
+        # The paths reach up to 3 cells away, so the border is that wide:
+        self.grid = Grid.from_lines(self.lines, border=0, border_width=3)
 
-    def matches_path(self, start_x: int, start_y: int, path: list[tuple[int, int]], want: tuple[str, ...]) -> bool:
-        found = self.get_char(start_x, start_y)
-        for item in path:
-            found += self.get_char(start_x + item[0], start_y + item[1])
+    def matches_path(self, start: int, path: list[int], want: tuple[bytes, ...]) -> bool:
+        cells = self.grid.cells
+        found = bytes([cells[start], *[cells[start + offset] for offset in path]])
         return found in want
 
     def part1(self) -> int:
         total = 0
 
-        right = [(1, 0), (2, 0), (3, 0)]
-        down = [(0, 1), (0, 2), (0, 3)]
-        south_east = [(1, 1), (2, 2), (3, 3)]
-        south_west = [(-1, 1), (-2, 2), (-3, 3)]
+        right = [self.grid.offset(1, 0), self.grid.offset(2, 0), self.grid.offset(3, 0)]
+        down = [self.grid.offset(0, 1), self.grid.offset(0, 2), self.grid.offset(0, 3)]
+        south_east = [self.grid.offset(1, 1), self.grid.offset(2, 2), self.grid.offset(3, 3)]
+        south_west = [self.grid.offset(-1, 1), self.grid.offset(-2, 2), self.grid.offset(-3, 3)]
         all_paths = [right, down, south_east, south_west]
-        want = ("XMAS", "SAMX")
+        want = (b"XMAS", b"SAMX")
 
-        for x in range(self.width):
-            for y in range(self.height):
-                for path in all_paths:
-                    if self.matches_path(x, y, path, want):
-                        total += 1
+        for index in self.grid.indexes():
+            for path in all_paths:
+                if self.matches_path(index, path, want):
+                    total += 1
 
         return total
 
@@ -44,19 +37,18 @@ class Day04(Day):
         x_shape = [
             # South-east:
             # (0, 0), This is implied
-            (1, 1),
-            (2, 2),
+            self.grid.offset(1, 1),
+            self.grid.offset(2, 2),
             # South-west:
-            (2, 0),
-            (1, 1),
-            (0, 2),
+            self.grid.offset(2, 0),
+            self.grid.offset(1, 1),
+            self.grid.offset(0, 2),
         ]
-        want = ("MASMAS", "SAMSAM", "MASSAM", "SAMMAS")
+        want = (b"MASMAS", b"SAMSAM", b"MASSAM", b"SAMMAS")
 
-        for x in range(self.width):
-            for y in range(self.height):
-                if self.matches_path(x, y, x_shape, want):
-                    total += 1
+        for index in self.grid.indexes():
+            if self.matches_path(index, x_shape, want):
+                total += 1
 
         return total
 
@@ -10,6 +10,8 @@ class Rule:
     after: int
 
 class Day05Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -1,27 +1,34 @@
 from __future__ import annotations
 
-from enum import Enum
-
-from util import Day
-
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
-
-def rotated(point: tuple[int, int]) -> tuple[int, int]:
-    if point == UP:
-        return RIGHT
-    if point == RIGHT:
-        return DOWN
-    if point == DOWN:
-        return LEFT
-    return UP
-
-class Contents(Enum):
-    EMPTY = 0
-    OBSTRUCTION = 1
-    START = 2
+from util import Day, Grid, check_characters, counters, parallel_map
+
+EMPTY = 0
+OBSTRUCTION = 1
+START = 2
+# Directions are indexes into Grid.offsets, which are in clockwise order:
+UP = 0
+# Where the guard stops when they walk off the grid instead of into an obstruction:
+EXIT = -1
+
+def rotated(direction: int) -> int:
+    return (direction + 1) % 4
+
+def jump_table(grid: Grid) -> list[int]:
+    """For every open cell and direction (at index cell * 4 + direction), the cell the guard stops at when walking that
+    way from it, just before the next obstruction, or EXIT if they walk off the grid."""
+    cells = grid.cells
+    jumps = [EXIT] * (len(cells) * 4)
+    for direction, offset in enumerate(grid.offsets):
+        # Cells further along the direction are filled in first, so each cell can take its stop from the next one:
+        indexes = list(grid.indexes())
+        if offset > 0:
+            indexes.reverse()
+        for index in indexes:
+            ahead = cells[index + offset]
+            if cells[index] == OBSTRUCTION or ahead == grid.border:
+                continue
+            jumps[index * 4 + direction] = index if ahead == OBSTRUCTION else jumps[(index + offset) * 4 + direction]
+    return jumps
 
 class Day06Base(Day):
     def __init__(
@@ -31,71 +38,93 @@ class Day06Base(Day):
             example: bool,
     ) -> None:
         super().__init__(6, part1_expect, part2_expect, example)
-        self.grid: dict[tuple[int, int], Contents] = {}
-        self.start: tuple[int, int] = (0, 0)
-        self.width = len(self.lines[0])
-        self.height = len(self.lines)
-
-        for x in range(self.width):
-            for y in range(self.height):
-                pos = (x, y)
-                char = self.lines[y][x]
-                if char == "#":
-                    self.grid[pos] = Contents.OBSTRUCTION
-                elif char == "^":
-                    self.grid[pos] = Contents.START
-                    self.start = pos
-
-    def grid_to_visited(self, grid: dict[tuple[int, int], Contents]) -> set[tuple[int, int]]:
-        current = self.start
-        direction = UP
-        visited: set[tuple[int, int]] = set()
-
-        while 0 <= current[0] < self.width and 0 <= current[1] < self.height:
-            visited.add(current)
-            next_point = (current[0] + direction[0], current[1] + direction[1])
-            contents = grid.get(next_point)
-            if contents == Contents.OBSTRUCTION:
-                direction = rotated(direction)
-            else:
-                current = next_point
-
-        return visited
-
-    def grid_causes_loop(self, grid: dict[tuple[int, int], Contents]) -> bool:
+        check_characters(self.lines, ".#^")
+        self.grid = Grid.from_lines(self.lines, {"#": OBSTRUCTION, "^": START}, fill=EMPTY)
+        self.start = next(self.grid.find(START))
+        self.jumps = jump_table(self.grid)
+        self.width = self.grid.width
+        self.height = self.grid.height
+
+    def guard_route(self, grid: Grid) -> list[tuple[int, int]]:
+        """The guard's position and direction at every step of their route, in order, where each step is either a move
+        or a turn on the spot."""
+        cells = grid.cells
+        offsets = grid.offsets
+        border = grid.border
         current = self.start
         direction = UP
-        turns: set[tuple[tuple[int, int], tuple[int, int]]] = {(self.start, direction)}
+        route: list[tuple[int, int]] = []
 
-        while 0 <= current[0] < self.width and 0 <= current[1] < self.height:
-            next_point = (current[0] + direction[0], current[1] + direction[1])
-            if grid.get(next_point) == Contents.OBSTRUCTION:
+        while cells[current] != border:
+            route.append((current, direction))
+            next_point = current + offsets[direction]
+            if cells[next_point] == OBSTRUCTION:
                 direction = rotated(direction)
-                current_and_direction = (current, direction)
-                if current_and_direction in turns:
-                    return True
-                turns.add(current_and_direction)
             else:
                 current = next_point
 
+        return route
+
+    @staticmethod
+    def grid_causes_loop(
+            grid: Grid,
+            jumps: list[int],
+            route_turns: dict[int, int],
+            candidate: tuple[int, int, int, int],
+    ) -> bool:
+        """Whether the guard walks in a loop once an extra obstruction is placed, jumping from turn to turn with the jump
+        table. Rather than patching the table for the extra obstruction, a jump along its row or column is cut short if
+        it's in the way, so neither the grid nor the table is changed, and candidates can be checked in parallel. The
+        route is the original one until the guard first reaches the obstruction, so the check resumes from there: the
+        candidate is the obstruction, the guard's position and direction the step before, and that step's number. Turns
+        the original route made before that step (in `route_turns`, by the step each was first made at) count as seen."""
+        obstruction, current, direction, step = candidate
+        offsets = grid.offsets
+        stride = offsets[2]
+        obstruction_row, obstruction_column = divmod(obstruction, stride)
+        turns: set[int] = set()
+
+        while True:
+            stop = jumps[current * 4 + direction]
+            offset = offsets[direction]
+            # Up and down (even directions) move along a column, and left and right along a row:
+            if (obstruction_column == current % stride) if direction % 2 == 0 else (obstruction_row == current // stride):
+                ahead = (obstruction - current) * offset > 0
+                if ahead and (stop == EXIT or (stop - obstruction) * offset >= 0):
+                    stop = obstruction - offset
+            if stop == EXIT:
+                break
+            direction = rotated(direction)
+            turn = stop * 4 + direction
+            if turn in turns or route_turns.get(turn, step) < step:
+                if counters.enabled:
+                    counters.add("grid_causes_loop turns", len(turns))
+                return True
+            turns.add(turn)
+            current = stop
+
+        if counters.enabled:
+            counters.add("grid_causes_loop turns", len(turns))
         return False
 
     def part1(self) -> int:
-        return len(self.grid_to_visited(self.grid))
+        return len({position for position, _ in self.guard_route(self.grid)})
 
     def part2(self) -> int:
-        loop_placements = 0
-        points_originally_visited = self.grid_to_visited(self.grid)
-        for point in points_originally_visited:
-            if point == self.start:
-                continue
-
-            self.grid[point] = Contents.OBSTRUCTION
-            if self.grid_causes_loop(self.grid):
-                loop_placements += 1
-            del self.grid[point]
-
-        return loop_placements
+        route = self.guard_route(self.grid)
+        route_turns: dict[int, int] = {}
+        candidates: list[tuple[int, int, int, int]] = []
+        visited = {self.start}
+        for step in range(1, len(route)):
+            position, direction = route[step]
+            previous, previous_direction = route[step - 1]
+            if position == previous:
+                route_turns.setdefault(position * 4 + direction, step)
+            elif position not in visited:
+                # An obstruction here is first hit from the step before:
+                visited.add(position)
+                candidates.append((position, previous, previous_direction, step))
+        return sum(parallel_map(self.grid_causes_loop, candidates, shared=(self.grid, self.jumps, route_turns)))
 
 class Day06Example(Day06Base):
     def __init__(self) -> None:
@@ -1,40 +1,138 @@
 from __future__ import annotations
 
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-
-from util import Day
-
-OPS = ["+", "*"]
+from enum import Enum
+from operator import add, mul
+
+from util import Day, counters, parallel_map
+
+
+class Left(Enum):
+    # What an inverse returns when every left operand gives the total, like undoing a multiplication by zero:
+    ANY = "any"
+
+def concatenation_power(number: int) -> int:
+    """The power of ten that a number is multiplied by when `number` is concatenated onto the end of it."""
+    power = 10
+    while power <= number:
+        power *= 10
+    return power
+
+def concatenate(left: int, right: int) -> int:
+    return left * concatenation_power(right) + right
+
+def subtracted(total: int, right: int) -> int:
+    return total - right
+
+def divided(total: int, right: int) -> int | Left | None:
+    if right == 0:
+        return Left.ANY if total == 0 else None
+    return total // right if total % right == 0 else None
+
+def deconcatenated(total: int, right: int) -> int | None:
+    power = concatenation_power(right)
+    return total // power if total % power == right else None
+
+@dataclass(frozen=True)
+class Operator:
+    symbol: str
+    apply: Callable[[int, int], int]
+    # Given a total and the right operand, the left operand that gives the total, or None if none does. Both are
+    # module-level functions, so operators can be pickled:
+    inverse: Callable[[int, int], int | Left | None] | None = None
+    # Whether non-negative operands always give a non-negative total, so a negative target can never be made:
+    non_negative: bool = False
+
+OPERATORS: dict[str, Operator] = {}
+
+def register(
+        symbol: str,
+        apply: Callable[[int, int], int],
+        inverse: Callable[[int, int], int | Left | None] | None = None,
+        non_negative: bool = False,
+) -> Operator:
+    if symbol in OPERATORS:
+        msg = f"{symbol} is already an operator"
+        raise ValueError(msg)
+    OPERATORS[symbol] = Operator(symbol, apply, inverse, non_negative)
+    return OPERATORS[symbol]
+
+def operators(symbols: Sequence[str]) -> list[Operator]:
+    missing = [symbol for symbol in symbols if symbol not in OPERATORS]
+    if len(missing) > 0:
+        msg = f"{', '.join(missing)} is not an operator, expected one of {', '.join(OPERATORS)}"
+        raise ValueError(msg)
+    return [OPERATORS[symbol] for symbol in symbols]
+
+register("+", add, subtracted, non_negative=True)
+register("*", mul, divided, non_negative=True)
+register("||", concatenate, deconcatenated, non_negative=True)
 
 @dataclass
 class Equation:
     result: int
     numbers: list[int]
 
-    def evaluation_valid(self, ops: list[str]) -> bool:
-        if len(self.numbers) == 1:
-            return self.numbers[0] == self.result
+    def evaluation_valid(self, ops: Sequence[Operator]) -> bool:
+        """Whether placing some combination of ops between the numbers (evaluated left to right) gives the result.
+
+        >>> from operator import sub
+        >>> Equation(8, [1, 5, 2, 10]).evaluation_valid([OPERATORS["+"], OPERATORS["*"], Operator("-", sub)])
+        True
+        """
+        backwards = all(op.inverse is not None and op.non_negative for op in ops) and min(self.numbers) >= 0
+        if backwards:
+            return self.solvable(self.result, len(self.numbers) - 1, ops)
+        # Without an inverse for every op, or once totals can go negative, nothing can be pruned, so every value the
+        # numbers give is found forwards:
+        return self.result in self.values(len(self.numbers) - 1, ops)
+
+    def solvable(self, target: int, index: int, ops: Sequence[Operator]) -> bool:
+        """Whether the numbers up to `index` can give `target`, for ops that all have inverses and never give negative
+        totals. This works backwards from the target, undoing the last number with each op's inverse, like subtracting
+        it, dividing by it (if it divides exactly), or removing it from the end (if the target ends with its digits).
+        Most ops can't be undone at each step, or leave a negative target, so most branches end right away."""
+        if counters.enabled:
+            counters.add("solvable calls")
+        last = self.numbers[index]
+        if index == 0:
+            return target == last
+        if target < 0:
+            return False
 
         for op in ops:
-            nums_next = self.numbers[:]
-            left = nums_next.pop(0)
-            right = nums_next.pop(0)
-            if op == "+":
-                nums_next.insert(0, left + right)
-                if Equation(result=self.result, numbers=nums_next).evaluation_valid(ops):
-                    return True
-            elif op == "*":
-                nums_next.insert(0, left * right)
-                if Equation(result=self.result, numbers=nums_next).evaluation_valid(ops):
-                    return True
-            elif op == "||":
-                nums_next.insert(0, int(str(left) + str(right)))
-                if Equation(result=self.result, numbers=nums_next).evaluation_valid(ops):
-                    return True
+            assert op.inverse is not None
+            left = op.inverse(target, last)
+            if left is Left.ANY or (left is not None and self.solvable(left, index - 1, ops)):
+                return True
 
         return False
 
+    def values(self, index: int, ops: Sequence[Operator]) -> set[int]:
+        """Every value the numbers up to `index` can give, found forwards."""
+        values = {self.numbers[0]}
+        for number in self.numbers[1:index + 1]:
+            if counters.enabled:
+                counters.add("forward evaluations", len(values) * len(ops))
+            values = {op.apply(value, number) for value in values for op in ops}
+        return values
+
+def calibration(ops: Sequence[Operator], equation: Equation) -> int:
+    return equation.result if equation.evaluation_valid(ops) else 0
+
+def calibration_total(equations: Sequence[Equation], ops: Sequence[Operator]) -> int:
+    """The total of the equations that some combination of ops makes valid, checked across the configured workers
+    (see util.parallel_map), which are given the ops once rather than with every chunk of equations."""
+    return sum(parallel_map(calibration, equations, shared=(ops,)))
+
+def parse_equation(line: str) -> Equation:
+    (result, remaining) = line.split(": ")
+    return Equation(int(result), [int(num) for num in remaining.split(" ")])
+
 class Day07Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -43,29 +141,13 @@ class Day07Base(Day):
     ) -> None:
         super().__init__(7, part1_expect, part2_expect, example)
 
-        self.equations: list[Equation] = []
-        for line in self.lines:
-            (result, remaining) = line.split(": ")
-            numbers = [int(num) for num in remaining.split(" ")]
-            self.equations.append(Equation(int(result), numbers))
+        self.equations = [parse_equation(line) for line in self.lines]
 
     def part1(self) -> int:
-        result = 0
-
-        for equation in self.equations:
-            if equation.evaluation_valid(ops=["+", "*"]):
-                result += equation.result
-
-        return result
+        return calibration_total(self.equations, operators(["+", "*"]))
 
     def part2(self) -> int:
-        result = 0
-
-        for equation in self.equations:
-            if equation.evaluation_valid(ops=["+", "*", "||"]):
-                result += equation.result
-
-        return result
+        return calibration_total(self.equations, operators(["+", "*", "||"]))
 
 class Day07Example(Day07Base):
     def __init__(self) -> None:
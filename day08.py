@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from util import Day
+from util import Day, Grid
 
+ANTINODE = 1
 
 class Day08Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -22,7 +25,7 @@ class Day08Base(Day):
                     self.antenna_locations_by_type.setdefault(char, []).append((x, y))
 
     def part1(self) -> int:
-        possible_antinodes: set[tuple[int, int]] = set()
+        antinodes = Grid(self.width, self.height)
 
         for locations in self.antenna_locations_by_type.values():
             for index, location_a in enumerate(locations):
@@ -30,37 +33,34 @@ class Day08Base(Day):
                     dist = (location_a[0] - location_b[0], location_a[1] - location_b[1])
                     antinode_a = (location_a[0] + dist[0], location_a[1] + dist[1])
                     antinode_b = (location_b[0] - dist[0], location_b[1] - dist[1])
-                    possible_antinodes.add(antinode_a)
-                    possible_antinodes.add(antinode_b)
-
-        result = 0
-        for antinode in possible_antinodes:
-            if 0 <= antinode[0] < self.width and 0 <= antinode[1] < self.height:
-                result += 1
+                    if antinodes.contains(*antinode_a):
+                        antinodes.cells[antinodes.index(*antinode_a)] = ANTINODE
+                    if antinodes.contains(*antinode_b):
+                        antinodes.cells[antinodes.index(*antinode_b)] = ANTINODE
 
-        return result
+        return antinodes.cells.count(ANTINODE)
 
     def part2(self) -> int:
-        antinodes: set[tuple[int, int]] = set()
+        antinodes = Grid(self.width, self.height)
 
         for locations in self.antenna_locations_by_type.values():
             for index, location_a in enumerate(locations):
-                antinodes.add(location_a)
+                antinodes.cells[antinodes.index(*location_a)] = ANTINODE
 
                 for location_b in locations[index + 1:]:
                     dist = (location_a[0] - location_b[0], location_a[1] - location_b[1])
                     antinode_a = (location_a[0] + dist[0], location_a[1] + dist[1])
                     antinode_b = (location_b[0] - dist[0], location_b[1] - dist[1])
 
-                    while 0 <= antinode_a[0] < self.width and 0 <= antinode_a[1] < self.height:
-                        antinodes.add(antinode_a)
+                    while antinodes.contains(*antinode_a):
+                        antinodes.cells[antinodes.index(*antinode_a)] = ANTINODE
                         antinode_a = (antinode_a[0] + dist[0], antinode_a[1] + dist[1])
 
-                    while 0 <= antinode_b[0] < self.width and 0 <= antinode_b[1] < self.height:
-                        antinodes.add(antinode_b)
+                    while antinodes.contains(*antinode_b):
+                        antinodes.cells[antinodes.index(*antinode_b)] = ANTINODE
                         antinode_b = (antinode_b[0] - dist[0], antinode_b[1] - dist[1])
 
-        return len(antinodes)
+        return antinodes.cells.count(ANTINODE)
 
 class Day08Example(Day08Base):
     def __init__(self) -> None:
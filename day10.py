@@ -1,9 +1,11 @@
 from collections.abc import Iterator
 
-from util import Day
+from util import Day, Grid, check_characters
 
 
 class Day10Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -12,45 +14,33 @@ class Day10Base(Day):
     ) -> None:
         super().__init__(10, part1_expect, part2_expect, example)
 
-        self.grid: dict[tuple[int, int], int] = {}
-        self.width = len(self.lines[0])
-        self.height = len(self.lines)
-        self.starts: list[tuple[int, int]] = []
-
-        for y, line in enumerate(self.lines):
-            for x, char in enumerate(line):
-                num = int(char)
-                self.grid[(x, y)] = num
-
-                if num == 0:
-                    self.starts.append((x, y))
-
-    def surrounding_positions(self, pos: tuple[int, int]) -> Iterator[tuple[int, int]]:
-        for diff in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            new_pos = pos[0] + diff[0], pos[1] + diff[1]
-            if 0 <= new_pos[0] < self.width and 0 <= new_pos[1] < self.height:
-                yield new_pos
-
-    def hikeable_positions(self, pos: tuple[int, int], visited: set[tuple[int, int]]) -> Iterator[tuple[int, int]]:
-        grade = self.grid[pos]
-        for other_pos in self.surrounding_positions(pos):
-            other_grade = self.grid[other_pos]
-            if other_grade - grade == 1 and other_pos not in visited:
+        heights = {str(num): num for num in range(10)}
+        # Characters that aren't heights would be stored as 0, which would make them trailheads:
+        check_characters(self.lines, heights)
+        self.grid = Grid.from_lines(self.lines, heights)
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.starts: list[int] = list(self.grid.find(0))
+
+    def hikeable_positions(self, pos: int) -> Iterator[int]:
+        cells = self.grid.cells
+        grade = cells[pos]
+        for offset in self.grid.offsets:
+            other_pos = pos + offset
+            if cells[other_pos] - grade == 1:
                 yield other_pos
 
-    def nines_reachable(self, start: tuple[int, int]) -> Iterator[tuple[int, int]]:
-        to_visit: list[tuple[tuple[int, int], set[tuple[int, int]]]] = [(start, {start})]
+    def nines_reachable(self, start: int) -> Iterator[int]:
+        # Every step climbs by exactly one, so a trail can never revisit a position, and there's no need to track
+        # which positions each trail has visited:
+        to_visit = [start]
 
         while len(to_visit) > 0:
-            pos, visited = to_visit.pop()
-            grade = self.grid[pos]
-            if grade == 9:
+            pos = to_visit.pop()
+            if self.grid.cells[pos] == 9:
                 yield pos
 
-            for new_pos in self.hikeable_positions(pos, visited):
-                new_visited = set(visited)
-                new_visited.add(new_pos)
-                to_visit.append((new_pos, new_visited))
+            to_visit.extend(self.hikeable_positions(pos))
 
     def part1(self) -> int:
         result = 0
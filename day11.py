@@ -1,10 +1,11 @@
 from collections.abc import Iterator
-from functools import cache
 
-from util import Day
+from util import Day, memoized
 
 
 class Day11Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -30,20 +31,19 @@ class Day11Base(Day):
             else:
                 yield stone * 2024
 
-    @staticmethod
-    @cache
-    def stone_number_to_count(stone: int, iters: int) -> int:
+    @memoized()
+    def stone_number_to_count(self, stone: int, iters: int) -> int:
         if iters == 0:
             return 1
 
         stones_next = list(Day11Base.produce_next([stone]))
-        return sum([Day11Base.stone_number_to_count(s, iters - 1) for s in stones_next])
+        return sum([self.stone_number_to_count(s, iters - 1) for s in stones_next])
 
     def part1(self) -> int:
-        return sum([Day11Base.stone_number_to_count(s, 25) for s in self.stones])
+        return sum([self.stone_number_to_count(s, 25) for s in self.stones])
 
     def part2(self) -> int:
-        return sum([Day11Base.stone_number_to_count(s, 75) for s in self.stones])
+        return sum([self.stone_number_to_count(s, 75) for s in self.stones])
 
 class Day11Example(Day11Base):
     def __init__(self) -> None:
@@ -1,20 +1,19 @@
-from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Literal
 
-from util import Day
+from util import Day, Grid
 
 
 @dataclass
 class Region:
     id: int
-    kind: str
-    points: set[tuple[int, int]]
+    kind: int
+    points: list[int]
 
-    def extents(self) -> tuple[tuple[int, int], tuple[int, int]]:
-        min_x, min_y = next(iter(self.points))
-        max_x, max_y = next(iter(self.points))
-        for (x, y) in self.points:
+    def extents(self, grid: Grid) -> tuple[tuple[int, int], tuple[int, int]]:
+        min_x, min_y = grid.point(self.points[0])
+        max_x, max_y = grid.point(self.points[0])
+        for (x, y) in (grid.point(point) for point in self.points):
             min_x = min(x, min_x)
             max_x = max(x, max_x)
             min_y = min(y, min_y)
@@ -24,7 +23,12 @@ class Region:
     def __hash__(self) -> int:
         return hash(self.id)
 
+# The region id of cells outside the grid:
+NO_REGION = -1
+
 class Day12Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -33,53 +37,39 @@ class Day12Base(Day):
     ) -> None:
         super().__init__(12, part1_expect, part2_expect, example)
 
-        self.grid: dict[tuple[int, int], str] = {}
-        self.regions: dict[tuple[int, int], Region] = {}
-        self.distinct_regions: set[Region] = set()
-        self.width = len(self.lines[0])
-        self.height = len(self.lines)
-
-        for y, line in enumerate(self.lines):
-            for x, char in enumerate(line):
-                self.grid[(x, y)] = char
+        # Counting sides compares each cell just outside a region with the cell beyond it, so the border is 2 wide:
+        self.grid = Grid.from_lines(self.lines, border=0, border_width=2)
+        self.region_ids = [NO_REGION] * len(self.grid.cells)
+        self.distinct_regions: list[Region] = []
+        self.width = self.grid.width
+        self.height = self.grid.height
 
-        for region_id, (point, kind) in enumerate(self.grid.items()):
-            region = self.regions.get(point)
-            if region:
+        cells = self.grid.cells
+        for point in self.grid.indexes():
+            if self.region_ids[point] != NO_REGION:
                 continue
-            region = Region(id=region_id, kind=kind, points={point})
-            self.regions[point] = region
-            self.distinct_regions.add(region)
+            kind = cells[point]
+            region = Region(id=len(self.distinct_regions), kind=kind, points=[point])
+            self.region_ids[point] = region.id
+            self.distinct_regions.append(region)
 
-            to_visit = set(self.adjacent(point))
-            visited = {point}
+            to_visit = [point]
             while len(to_visit) > 0:
-                new_point = to_visit.pop()
-                if new_point in visited:
-                    continue
-                visited.add(new_point)
-
-                new_kind = self.grid.get(new_point)
-                if kind == new_kind:
-                    to_visit.update(self.adjacent(new_point))
-                    region.points.add(new_point)
-                    self.regions[new_point] = region
-
-    @staticmethod
-    def adjacent(point: tuple[int, int]) -> Iterator[tuple[int, int]]:
-        diffs = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        for diff in diffs:
-            new_point = (point[0] + diff[0], point[1] + diff[1])
-            yield new_point
+                current = to_visit.pop()
+                for offset in self.grid.offsets:
+                    new_point = current + offset
+                    if cells[new_point] == kind and self.region_ids[new_point] == NO_REGION:
+                        self.region_ids[new_point] = region.id
+                        region.points.append(new_point)
+                        to_visit.append(new_point)
 
     def price_perimeter(self, region: Region) -> int:
         area = len(region.points)
         perimeter = 0
 
         for point in region.points:
-            for other_point in self.adjacent(point):
-                other_region = self.regions.get(other_point)
-                if region != other_region:
+            for offset in self.grid.offsets:
+                if self.region_ids[point + offset] != region.id:
                     perimeter += 1
 
         return area * perimeter
@@ -93,15 +83,15 @@ class Day12Base(Day):
         diff: tuple[int, int],
     ) -> int:
         sides = 0
+        offset = self.grid.offset(*diff)
         if direction == "horizontal":
             range_a, range_b = range_b, range_a
 
         for a in range_a:
             placing = False
             for b in range_b:
-                point = (b, a) if direction == "horizontal" else (a, b)
-                comparison_point = (point[0] + diff[0], point[1] + diff[1])
-                if self.regions.get(point) != region and self.regions.get(comparison_point) == region:
+                point = self.grid.index(b, a) if direction == "horizontal" else self.grid.index(a, b)
+                if self.region_ids[point] != region.id and self.region_ids[point + offset] == region.id:
                     if not placing:
                         placing = True
                         sides += 1
@@ -114,7 +104,7 @@ class Day12Base(Day):
         area = len(region.points)
         sides = 0
 
-        top_left, bottom_right = region.extents()
+        top_left, bottom_right = region.extents(self.grid)
         x_range = range(top_left[0] - 1, bottom_right[0] + 2)
         y_range = range(top_left[1] - 1, bottom_right[1] + 2)
 
@@ -41,6 +41,8 @@ class Robot:
         return 4
 
 class Day14Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             width: int,
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
-from enum import Enum
+from enum import IntEnum
 
-from util import Day
+from util import Day, Grid
 
 
-class Entity(Enum):
-    WALL = 0
-    BOX = 1
-    BOX_LEFT = 2
-    BOX_RIGHT = 3
-    ROBOT = 4
+class Entity(IntEnum):
+    EMPTY = 0
+    WALL = 1
+    BOX = 2
+    BOX_LEFT = 3
+    BOX_RIGHT = 4
+    ROBOT = 5
 
     @staticmethod
     def from_char(c: str) -> Entity:
+        if c == ".":
+            return Entity.EMPTY
         if c == "#":
             return Entity.WALL
         if c == "O":
@@ -23,12 +26,13 @@ class Entity(Enum):
         msg = f"Unknown character '{c}'"
         raise ValueError(msg)
 
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+# Directions index Grid.offsets, which differ between the normal and the widened grid:
+UP = 0
+RIGHT = 1
+DOWN = 2
+LEFT = 3
 
-def dir_from_char(c: str) -> tuple[int, int]:
+def dir_from_char(c: str) -> int:
     if c == "^":
         return UP
     if c == "v":
@@ -41,6 +45,8 @@ def dir_from_char(c: str) -> tuple[int, int]:
     raise ValueError(msg)
 
 class Day15Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -49,89 +55,86 @@ class Day15Base(Day):
     ) -> None:
         super().__init__(15, part1_expect, part2_expect, example)
 
-        self.grid_initial: dict[tuple[int, int], Entity] = {}
-        self.grid_initial2: dict[tuple[int, int], Entity] = {}
-        self.instructions: list[tuple[int, int]] = []
+        self.instructions: list[int] = []
 
         index = self.lines.index("")
         grid_lines = self.lines[:index]
         instruction_lines = self.lines[index + 1 :]
         self.width = len(self.lines[0])
         self.height = len(grid_lines)
-        self.start = (-1, -1)
-        self.start2 = (-1, -1)
+        self.grid_initial = Grid(self.width, self.height, border=Entity.WALL)
+        self.grid_initial2 = Grid(self.width * 2, self.height, border=Entity.WALL)
+        self.start = -1
+        self.start2 = -1
 
         for y in range(self.height):
             for x in range(self.width):
-                c = grid_lines[y][x]
-                if c != ".":
-                    entity = Entity.from_char(c)
-                    self.grid_initial[(x, y)] = entity
-
-                    if entity == Entity.ROBOT:
-                        self.grid_initial2[(x * 2, y)] = Entity.ROBOT
-                        self.start = (x, y)
-                        self.start2 = (x * 2, y)
-                    elif entity == Entity.BOX:
-                        self.grid_initial2[(x * 2, y)] = Entity.BOX_LEFT
-                        self.grid_initial2[(x * 2 + 1, y)] = Entity.BOX_RIGHT
-                    else:
-                        self.grid_initial2[(x * 2, y)] = entity
-                        self.grid_initial2[(x * 2 + 1, y)] = entity
+                entity = Entity.from_char(grid_lines[y][x])
+                self.grid_initial.cells[self.grid_initial.index(x, y)] = entity
+                left = self.grid_initial2.index(x * 2, y)
+
+                if entity == Entity.ROBOT:
+                    self.grid_initial2.cells[left] = Entity.ROBOT
+                    self.start = self.grid_initial.index(x, y)
+                    self.start2 = left
+                elif entity == Entity.BOX:
+                    self.grid_initial2.cells[left] = Entity.BOX_LEFT
+                    self.grid_initial2.cells[left + 1] = Entity.BOX_RIGHT
+                else:
+                    self.grid_initial2.cells[left] = entity
+                    self.grid_initial2.cells[left + 1] = entity
 
         for line in instruction_lines:
             for char in line:
                 self.instructions.append(dir_from_char(char))
 
     @staticmethod
-    def touching(
-        grid: dict[tuple[int, int], Entity],
-        start: tuple[int, int],
-        direction: tuple[int, int],
-    ) -> tuple[set[tuple[int, int, Entity]], set[Entity]]:
-        positions: set[tuple[int, int, Entity]] = set()
-        entities: set[Entity] = set()
+    def touching(grid: Grid, start: int, direction: int) -> tuple[set[tuple[int, int]], set[int]]:
+        positions: set[tuple[int, int]] = set()
+        entities: set[int] = set()
+        offset = grid.offsets[direction]
         current = start
-        while current in grid:
-            entity = grid[current]
-            positions.add((current[0], current[1], entity))
+        while (entity := grid.cells[current]) != Entity.EMPTY:
+            positions.add((current, entity))
             entities.add(entity)
+            if entity == Entity.WALL:
+                # Nothing beyond a wall can move, and past the border there's nothing but more border:
+                break
 
             if current != start and direction in (UP, DOWN):
                 if entity == Entity.BOX_LEFT:
-                    other_positions, other_entities = Day15Base.touching(grid, (current[0] + 1, current[1]), direction)
+                    other_positions, other_entities = Day15Base.touching(grid, current + 1, direction)
                 elif entity == Entity.BOX_RIGHT:
-                    other_positions, other_entities = Day15Base.touching(grid, (current[0] - 1, current[1]), direction)
+                    other_positions, other_entities = Day15Base.touching(grid, current - 1, direction)
                 else:
                     other_positions = set()
                     other_entities = set()
 
-                for other_pos in other_positions:
-                    positions.add(other_pos)
-                for other_entity in other_entities:
-                    entities.add(other_entity)
+                positions.update(other_positions)
+                entities.update(other_entities)
 
-            current = (current[0] + direction[0], current[1] + direction[1])
+            current += offset
 
         return positions, entities
 
-    def simulate(self, grid: dict[tuple[int, int], Entity], start: tuple[int, int]) -> int:
+    def simulate(self, grid: Grid, start: int) -> int:
         current = start
         for instruction in self.instructions:
             positions_to_move, entities = self.touching(grid, current, instruction)
             if Entity.WALL in entities:
                 continue
-            for x, y, _ in positions_to_move:
-                del grid[(x, y)]
-            for (x, y, entity) in positions_to_move:
-                new_pos = (x + instruction[0], y + instruction[1])
-                grid[new_pos] = entity
+            offset = grid.offsets[instruction]
+            for position, _ in positions_to_move:
+                grid.cells[position] = Entity.EMPTY
+            for position, entity in positions_to_move:
+                grid.cells[position + offset] = entity
                 if entity == Entity.ROBOT:
-                    current = new_pos
+                    current = position + offset
 
         result = 0
-        for (x, y), entity in grid.items():
-            if entity in (Entity.BOX, Entity.BOX_LEFT):
+        for index in grid.indexes():
+            if grid.cells[index] in (Entity.BOX, Entity.BOX_LEFT):
+                x, y = grid.point(index)
                 result += y * 100 + x
         return result
 
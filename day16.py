@@ -1,37 +1,31 @@
 from __future__ import annotations
 
-from enum import Enum
+from collections.abc import Iterator
+from enum import IntEnum
 
-from util import Day
+from util import Day, Grid, SearchResult, check_characters, dijkstra
 
 
-class Entity(Enum):
-    WALL = 0
-    START = 1
-    END = 2
+class Entity(IntEnum):
+    EMPTY = 0
+    WALL = 1
+    START = 2
+    END = 3
 
-    @staticmethod
-    def from_char(c: str) -> Entity:
-        if c == "#":
-            return Entity.WALL
-        if c == "S":
-            return Entity.START
-        if c == "E":
-            return Entity.END
-        msg = f"Unknown character '{c}'"
-        raise ValueError(msg)
+CHAR_ENTITIES = {"#": Entity.WALL, "S": Entity.START, "E": Entity.END}
 
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+# Directions index Grid.offsets:
+UP = 0
+RIGHT = 1
+DOWN = 2
+LEFT = 3
 
-def turns(direction: tuple[int, int]) -> list[tuple[int, int]]:
-    if direction in (UP, DOWN):
-        return [LEFT, RIGHT]
-    return [UP, DOWN]
+def turns(direction: int) -> list[int]:
+    return [(direction + 1) % 4, (direction + 3) % 4]
 
 class Day16Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -39,74 +33,36 @@ class Day16Base(Day):
             example: bool,
     ) -> None:
         super().__init__(16, part1_expect, part2_expect, example)
-        self.grid: dict[tuple[int, int], Entity] = {}
-        self.width = len(self.lines[0])
-        self.height = len(self.lines)
-        self.start = (-1, -1)
-        self.end = (-1, -1)
-
-        for y in range(self.height):
-            for x in range(self.width):
-                char = self.lines[y][x]
-                if char != ".":
-                    entity = Entity.from_char(char)
-                    self.grid[(x, y)] = entity
-                    if entity == Entity.START:
-                        self.start = (x, y)
-                    elif entity == Entity.END:
-                        self.end = (x, y)
+        check_characters(self.lines, [".", *CHAR_ENTITIES])
+        self.grid = Grid.from_lines(self.lines, CHAR_ENTITIES, border=Entity.WALL)
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.start = next(self.grid.find(Entity.START))
+        self.end = next(self.grid.find(Entity.END))
 
         self.costs = self.compute_costs()
 
-    def compute_costs(self) -> dict[tuple[tuple[int, int], tuple[int, int]], int]:
-        to_visit = {(self.start, RIGHT, 0)}
-        visited: dict[tuple[tuple[int, int], tuple[int, int]], int] = {}
-
-        while len(to_visit) > 0:
-            pos, facing, cost = to_visit.pop()
-            existing_cost = visited.get((pos, facing))
-            if existing_cost and existing_cost < cost:
-                continue
-            visited[(pos, facing)] = cost
+    def moves(self, state: tuple[int, int]) -> Iterator[tuple[tuple[int, int], int]]:
+        pos, facing = state
+        next_pos = pos + self.grid.offsets[facing]
+        if self.grid.cells[next_pos] != Entity.WALL:
+            yield (next_pos, facing), 1
+        for turn in turns(facing):
+            yield (pos, turn), 1000
 
-            next_pos = (pos[0] + facing[0], pos[1] + facing[1])
-            if self.grid.get(next_pos) != Entity.WALL:
-                to_visit.add((next_pos, facing, cost + 1))
+    def compute_costs(self) -> SearchResult[tuple[int, int]]:
+        return dijkstra([(self.start, RIGHT)], self.moves, track_predecessors=True)
 
-            for turn in turns(facing):
-                to_visit.add((pos, turn, cost + 1000))
-
-        return visited
+    def end_states(self) -> list[tuple[int, int]]:
+        return [(self.end, direction) for direction in (UP, DOWN, LEFT, RIGHT) if (self.end, direction) in self.costs.distances]
 
     def part1(self) -> int:
-        return min(self.costs[(self.end, direction)] for direction in (UP, DOWN, LEFT, RIGHT))
+        return min(self.costs.distances[state] for state in self.end_states())
 
     def part2(self) -> int:
-        to_visit: list[tuple[tuple[int, int], tuple[int, int], int, frozenset[tuple[int, int]]]] = [
-            (self.start, RIGHT, 0, frozenset([self.start])),
-        ]
-        tiles_in_end_paths: set[tuple[int, int]] = set()
-
         end_cost = self.part1()
-        while len(to_visit) > 0:
-            pos, facing, cost, path = to_visit.pop()
-            if len(path - tiles_in_end_paths) == 0:
-                continue
-
-            if self.end == pos:
-                if cost == end_cost:
-                    tiles_in_end_paths.update(path)
-                continue
-
-            next_pos = (pos[0] + facing[0], pos[1] + facing[1])
-            if self.grid.get(next_pos) != Entity.WALL and self.costs[(next_pos, facing)] == cost + 1:
-                to_visit.append((next_pos, facing, cost + 1, path | frozenset([next_pos])))
-
-            for turn in turns(facing):
-                if self.costs[(pos, turn)] == cost + 1000:
-                    to_visit.append((pos, turn, cost + 1000, path))
-
-        return len(tiles_in_end_paths)
+        best_ends = [state for state in self.end_states() if self.costs.distances[state] == end_cost]
+        return len({pos for pos, _ in self.costs.path_nodes(best_ends)})
 
 class Day16Example(Day16Base):
     def __init__(self) -> None:
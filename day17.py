@@ -4,7 +4,7 @@ import copy
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 
-from util import Day
+from util import Day, counters
 
 
 @dataclass
@@ -29,6 +29,8 @@ class Computer:
         raise ValueError(msg)
 
     def process_instruction(self) -> None:
+        if counters.enabled:
+            counters.add("process_instruction steps")
         opcode = self.program[self.instruction_pointer] if self.instruction_pointer < len(self.program) else None
         operand = self.program[self.instruction_pointer + 1] if self.instruction_pointer + 1 < len(self.program) else None
         self.instruction_pointer += 2
@@ -70,6 +72,8 @@ class Computer:
         return self.output_str
 
 class Day17Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from util import Day
+from collections.abc import Callable, Iterator
 
+from util import Day, Grid, bfs
+
+OCCUPIED = 1
 
 class Day18Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_steps: int,
@@ -20,44 +25,30 @@ class Day18Base(Day):
             left, right = line.split(",")
             self.bytes.append((int(left), int(right)))
 
-    def find_shortest_path(self, occupied: set[tuple[int, int]]) -> int:
-        to_visit = [((0, 0), 0)]
-        visited: dict[tuple[int, int], int] = {}
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-
-        while len(to_visit) > 0:
-            pos, cost = to_visit.pop(0)
-            cost_existing = visited.get(pos)
-            if cost_existing and cost >= cost_existing:
-                continue
-            visited[pos] = cost
-
-            for diff in directions:
-                new_pos = (pos[0] + diff[0], pos[1] + diff[1])
-                if new_pos not in occupied and 0 <= new_pos[0] <= self.end[0] and 0 <= new_pos[1] <= self.end[1]:
-                    to_visit.append((new_pos, cost + 1))
-
-        return visited.get(self.end, -1)
-
-    def is_connected_to_end(self, occupied: set[tuple[int, int]]) -> bool:
-        to_visit = [(0, 0)]
-        visited: set[tuple[int, int]] = set()
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    def occupied_grid(self, steps: int) -> Grid:
+        """A grid of the memory space, with the first `steps` bytes (and the border) marked as occupied."""
+        grid = Grid(self.end[0] + 1, self.end[1] + 1, fill=0, border=OCCUPIED)
+        for i in range(steps):
+            grid.cells[grid.index(*self.bytes[i])] = OCCUPIED
+        return grid
 
-        while len(to_visit) > 0:
-            pos = to_visit.pop(0)
+    @staticmethod
+    def open_neighbors(grid: Grid) -> Callable[[int], Iterator[int]]:
+        cells = grid.cells
+        offsets = grid.offsets
+        return lambda pos: (pos + offset for offset in offsets if cells[pos + offset] != OCCUPIED)
 
-            for diff in directions:
-                new_pos = (pos[0] + diff[0], pos[1] + diff[1])
-                if new_pos not in occupied and new_pos not in visited and 0 <= new_pos[0] <= self.end[0] and 0 <= new_pos[1] <= self.end[1]:
-                    to_visit.append(new_pos)
-                    visited.add(new_pos)
+    def find_shortest_path(self, grid: Grid) -> int:
+        end = grid.index(*self.end)
+        result = bfs([grid.index(0, 0)], self.open_neighbors(grid), goal=lambda pos: pos == end)
+        return result.distances.get(end, -1)
 
-        return self.end in visited
+    def is_connected_to_end(self, grid: Grid) -> bool:
+        end = grid.index(*self.end)
+        return bfs([grid.index(0, 0)], self.open_neighbors(grid), goal=lambda pos: pos == end).goal is not None
 
     def part1(self) -> int:
-        occupied: set[tuple[int, int]] = {self.bytes[i] for i in range(self.part1_steps)}
-        return self.find_shortest_path(occupied)
+        return self.find_shortest_path(self.occupied_grid(self.part1_steps))
 
     def part2(self) -> str:
         # Do a binary search to narrow it down quickly:
@@ -65,13 +56,11 @@ class Day18Base(Day):
         while len(indexes_to_check) > 2:
             midpoint = len(indexes_to_check) // 2
             index = indexes_to_check[midpoint]
-            occupied: set[tuple[int, int]] = {self.bytes[i] for i in range(index)}
-            is_connected = self.is_connected_to_end(occupied)
+            is_connected = self.is_connected_to_end(self.occupied_grid(index))
             indexes_to_check = indexes_to_check[midpoint:] if is_connected else indexes_to_check[:midpoint + 1]
 
         for index in indexes_to_check:
-            occupied = {self.bytes[i] for i in range(index)}
-            if self.is_connected_to_end(occupied):
+            if self.is_connected_to_end(self.occupied_grid(index)):
                 byte = self.bytes[index]
                 return f"{byte[0]},{byte[1]}"
 
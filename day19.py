@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from functools import cache
-
-from util import Day
+from util import Day, memoized
 
 
 class Day19Base(Day):
+    parts_independent = True
+
     def __init__(
             self,
             part1_expect: str | int | None,
@@ -16,7 +16,7 @@ class Day19Base(Day):
         self.towels = self.lines[0].split(", ")
         self.patterns_wanted = self.lines[2:]
 
-    @cache
+    @memoized()
     def can_continue_pattern(self, pattern: str) -> bool:
         if pattern == "":
             return True
@@ -27,7 +27,7 @@ class Day19Base(Day):
 
         return False
 
-    @cache
+    @memoized()
     def pattern_possibilities(self, pattern: str) -> int:
         if pattern == "":
             return 1
@@ -3,7 +3,7 @@ from __future__ import annotations
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 
-from util import Day
+from util import Day, bfs, memoized
 
 UP = (0, -1)
 DOWN = (0, 1)
@@ -70,20 +70,7 @@ class RobotKeypad:
                 yield direction, new_pos
 
     def visit_costs(self, start: tuple[int, int]) -> dict[tuple[int, int], int]:
-        to_visit = {(start, 0)}
-        visited: dict[tuple[int, int], int] = {}
-
-        while len(to_visit) > 0:
-            pos, cost = to_visit.pop()
-            existing_cost = visited.get(pos)
-            if existing_cost is not None and existing_cost <= cost:
-                continue
-            visited[pos] = cost
-
-            for _, new_pos in self.adjacent(pos):
-                to_visit.add((new_pos, cost + 1))
-
-        return visited
+        return bfs([start], lambda pos: (new_pos for _, new_pos in self.adjacent(pos))).distances
 
     def shortest_paths(self, start: tuple[int, int], end: tuple[int, int]) -> list[list[tuple[int, int]]]:
         cached = self.shortest_paths_cache.get((start, end))
@@ -163,47 +150,6 @@ def split_on_a(splitting: str) -> Iterator[str]:
             yield next_output
             next_output = ""
 
-shortest_sequence_cache: dict[tuple[str, int], int] = {}
-# This function recursively finds the shortest sequence length required for a given set of keys to be inputted into
-# a keypad.
-#
-# A depth of 0 means no robots are involved, a human is pressing keys, and so the sequence length is the length of the
-# keys to press.
-#
-# A depth of 1 or more means robots are involved, and so we must determine how many moves the robot takes to enter
-# the required keys. We assume the first robot is operating a numpad, and all others operate dirpads. Each robot
-# can tell us possible sequences of inputs it can use to enter a given sequence on its keypad.
-#
-# Because there is a chain of robots all operating each other, once we have a sequence of inputs that will cause a
-# a robot to enter the correct keys, we must recursively figure out how to make the next robot produce that new sequence
-# (our new set of keys) until we get to depth 0 (the human).
-#
-# The key observation that makes this work recursively is that every time a robot presses "A", it has returned to its
-# starting position. So, we can chunk its keys on "A", computing the total for each small chunk. This is much faster
-# than operating on the full input, and it lets us easily cache the totals at each depth level.
-#
-# A debt is owed to https://www.reddit.com/r/adventofcode/comments/1hjx0x4/2024_day_21_quick_tutorial_to_solve_part_2_in/
-# which showed me this method. While I had many of the necessary insights and code implemented, I could not for the
-# life of me figure out how to put it all together in a way that was efficient enough for part 2.
-def shortest_sequence(numpad: RobotKeypad, dirpad: RobotKeypad, keys: str, depth: int, is_start: bool) -> int:
-    if depth == 0:
-        return len(keys)
-
-    cached = shortest_sequence_cache.get((keys, depth))
-    if cached is not None:
-        return cached
-
-    keypad = numpad if is_start else dirpad
-
-    total = 0
-    for sub_key in split_on_a(keys):
-        possibilities = keypad.movements_required_to_enter(sub_key)
-        minimum = min(shortest_sequence(numpad, dirpad, directions_to_str(possibility), depth - 1, False) for possibility in possibilities)
-        total += minimum
-
-    shortest_sequence_cache[(keys, depth)] = total
-    return total
-
 @dataclass
 class Simulator:
     numpad: RobotKeypad
@@ -244,6 +190,8 @@ class Simulator:
         return self.output
 
 class Day21Base(Day):
+    parts_independent = True
+
     def __init__(
         self,
         part1_expect: str | int | None,
@@ -274,16 +222,52 @@ class Day21Base(Day):
 
         self.sim = Simulator(numpad=self.numpad, dirpad=self.dirpad, numpad_robot_pos=self.numpad.robot_start, dirpad_robot_1_pos=self.dirpad.robot_start, dirpad_robot_2_pos=self.dirpad.robot_start)
 
+    # This method recursively finds the shortest sequence length required for a given set of keys to be inputted into
+    # a keypad.
+    #
+    # A depth of 0 means no robots are involved, a human is pressing keys, and so the sequence length is the length of the
+    # keys to press.
+    #
+    # A depth of 1 or more means robots are involved, and so we must determine how many moves the robot takes to enter
+    # the required keys. We assume the first robot is operating a numpad, and all others operate dirpads. Each robot
+    # can tell us possible sequences of inputs it can use to enter a given sequence on its keypad.
+    #
+    # Because there is a chain of robots all operating each other, once we have a sequence of inputs that will cause a
+    # a robot to enter the correct keys, we must recursively figure out how to make the next robot produce that new sequence
+    # (our new set of keys) until we get to depth 0 (the human).
+    #
+    # The key observation that makes this work recursively is that every time a robot presses "A", it has returned to its
+    # starting position. So, we can chunk its keys on "A", computing the total for each small chunk. This is much faster
+    # than operating on the full input, and it lets us easily cache the totals at each depth level.
+    #
+    # A debt is owed to https://www.reddit.com/r/adventofcode/comments/1hjx0x4/2024_day_21_quick_tutorial_to_solve_part_2_in/
+    # which showed me this method. While I had many of the necessary insights and code implemented, I could not for the
+    # life of me figure out how to put it all together in a way that was efficient enough for part 2.
+    @memoized()
+    def shortest_sequence(self, keys: str, depth: int, is_start: bool) -> int:
+        if depth == 0:
+            return len(keys)
+
+        keypad = self.numpad if is_start else self.dirpad
+
+        total = 0
+        for sub_key in split_on_a(keys):
+            possibilities = keypad.movements_required_to_enter(sub_key)
+            minimum = min(self.shortest_sequence(directions_to_str(possibility), depth - 1, False) for possibility in possibilities)
+            total += minimum
+
+        return total
+
     def part1(self) -> int:
         result = 0
         for line in self.lines:
-            result += shortest_sequence(self.numpad, self.dirpad, line, 1 + 2, True) * int(line[:-1])
+            result += self.shortest_sequence(line, 1 + 2, True) * int(line[:-1])
         return result
 
     def part2(self) -> int:
         result = 0
         for line in self.lines:
-            result += shortest_sequence(self.numpad, self.dirpad, line, 1 + 25, True) * int(line[:-1])
+            result += self.shortest_sequence(line, 1 + 25, True) * int(line[:-1])
         return result
 
 class Day21Example(Day21Base):
@@ -24,6 +24,8 @@ def prune(secret: int) -> int:
     return secret % 16777216
 
 class Day22Base(Day):
+    parts_independent = True
+
     def __init__(
         self,
         part1_expect: str | int | None,
@@ -29,6 +29,8 @@ def score_transitives(graph: dict[str, set[str]]) -> Counter[str]:
     return result
 
 class Day23Base(Day):
+    parts_independent = True
+
     def __init__(
         self,
         part1_expect: str | int | None,
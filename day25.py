@@ -11,6 +11,8 @@ def pivot(strings: list[str]) -> list[str]:
     return result
 
 class Day25Base(Day):
+    parts_independent = True
+
     def __init__(
         self,
         part1_expect: str | int | None,
@@ -0,0 +1,274 @@
+"""Generators for synthetic puzzle inputs of any size, for benchmarking how solutions scale.
+
+The `scale` is relative to the size of a real input: a scale of 4 produces roughly 4 times as many lines, or a grid
+with 4 times as many cells (so twice as wide and twice as tall)."""
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Callable
+from functools import partial
+from importlib import import_module
+from math import sqrt
+from random import Random
+from typing import cast
+
+from util import Day, day_class_for
+
+DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+def scaled(size: int, scale: float) -> int:
+    return max(1, round(size * scale))
+
+def scaled_side(side: int, scale: float) -> int:
+    return max(5, round(side * sqrt(scale)))
+
+def maze(width: int, height: int, rng: Random) -> list[list[str]]:
+    """Carves a perfect maze (exactly one path between any two open cells) with a randomized depth-first search. Open
+    cells are at odd coordinates, so the grid is surrounded by walls."""
+    grid = [["#"] * width for _ in range(height)]
+    grid[1][1] = "."
+    stack = [(1, 1)]
+    while len(stack) > 0:
+        x, y = stack[-1]
+        options = [
+            (x + dx * 2, y + dy * 2, x + dx, y + dy)
+            for dx, dy in DIRECTIONS
+            if 0 < x + dx * 2 < width - 1 and 0 < y + dy * 2 < height - 1 and grid[y + dy * 2][x + dx * 2] == "#"
+        ]
+        if len(options) == 0:
+            stack.pop()
+            continue
+        next_x, next_y, between_x, between_y = rng.choice(options)
+        grid[between_y][between_x] = "."
+        grid[next_y][next_x] = "."
+        stack.append((next_x, next_y))
+    return grid
+
+def odd(side: int) -> int:
+    return side if side % 2 == 1 else side + 1
+
+def day01(scale: float, rng: Random) -> str:
+    # The right list repeats numbers from a smaller pool, and half the left list is drawn from the same pool, so part
+    # 2's similarity scores aren't all zero:
+    pool = [rng.randint(10000, 99999) for _ in range(scaled(300, scale))]
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        left = rng.choice(pool) if rng.random() < 0.5 else rng.randint(10000, 99999)
+        lines.append(f"{left}   {rng.choice(pool)}\n")
+    return "".join(lines)
+
+def day02(scale: float, rng: Random) -> str:
+    lines: list[str] = []
+    for _ in range(scaled(1000, scale)):
+        direction = rng.choice([-1, 1])
+        report = [rng.randint(20, 80)]
+        for _ in range(rng.randint(4, 7)):
+            report.append(report[-1] + direction * rng.randint(1, 3))
+        # About half the reports get a single bad level, which part 2 may be able to remove:
+        if rng.random() < 0.5:
+            report[rng.randrange(len(report))] += rng.choice([-4, 0, 4])
+        lines.append(" ".join(str(level) for level in report))
+    return "\n".join(lines) + "\n"
+
+def day06(scale: float, rng: Random) -> str:
+    side = scaled_side(130, scale)
+    while True:
+        grid, start, visited = guard_walk(side, rng)
+        # Scattered obstructions that are off the route don't change it, but give part 2 more to collide with:
+        for _ in range(side * side // 40):
+            x, y = rng.randrange(side), rng.randrange(side)
+            if (x, y) not in visited:
+                grid[y][x] = "#"
+        grid[start[1]][start[0]] = "^"
+        # Random layouts mostly send the guard straight off the map, so short routes are thrown away:
+        route = guard_route(grid, start)
+        if route is not None and route >= side * side // 12:
+            return "".join("".join(row) + "\n" for row in grid)
+
+def guard_walk(side: int, rng: Random) -> tuple[list[list[str]], tuple[int, int], set[tuple[int, int]]]:
+    """Walks a guard from the middle of an empty map, placing an obstruction wherever it should turn. Obstructions are
+    never placed on cells the guard already walked through, which would change the earlier route."""
+    grid = [["."] * side for _ in range(side)]
+    x, y = side // 2, side // 2
+    start = (x, y)
+    direction = 0
+    visited = {start}
+    for _ in range(side * 4):
+        dx, dy = DIRECTIONS[direction]
+        run = 0
+        while 0 <= x + dx * (run + 1) < side and 0 <= y + dy * (run + 1) < side and grid[y + dy * (run + 1)][x + dx * (run + 1)] != "#":
+            run += 1
+        # Stop short of the edge, so the guard doesn't leave the map yet:
+        if not (0 <= x + dx * (run + 1) < side and 0 <= y + dy * (run + 1) < side):
+            run -= 1
+        if run <= 0:
+            direction = (direction + 1) % 4
+            continue
+
+        for _ in range(rng.randint(1, run)):
+            x, y = x + dx, y + dy
+            visited.add((x, y))
+        blocker = (x + dx, y + dy)
+        if blocker in visited and grid[blocker[1]][blocker[0]] != "#":
+            continue
+        grid[blocker[1]][blocker[0]] = "#"
+        direction = (direction + 1) % 4
+    return grid, start, visited
+
+def guard_route(grid: list[list[str]], start: tuple[int, int]) -> int | None:
+    """Counts the cells on the guard's route, or returns None if it loops (Day 6 requires it to leave the map)."""
+    (x, y), direction = start, 0
+    seen: set[tuple[int, int, int]] = set()
+    while (x, y, direction) not in seen:
+        seen.add((x, y, direction))
+        dx, dy = DIRECTIONS[direction]
+        if not (0 <= x + dx < len(grid[0]) and 0 <= y + dy < len(grid)):
+            return len({(x, y) for x, y, _ in seen})
+        if grid[y + dy][x + dx] == "#":
+            direction = (direction + 1) % 4
+        else:
+            x, y = x + dx, y + dy
+    return None
+
+def day07(scale: float, rng: Random) -> str:
+    lines: list[str] = []
+    for _ in range(scaled(850, scale)):
+        numbers = [rng.randint(1, 999) for _ in range(rng.randint(2, 10))]
+        result = numbers[0]
+        for number in numbers[1:]:
+            operator = rng.choice(["+", "*", "||"])
+            if operator == "+":
+                result += number
+            elif operator == "*":
+                result *= number
+            else:
+                result = int(f"{result}{number}")
+        # Some equations can't be made true by any operators:
+        if rng.random() < 0.4:
+            result += 1
+        lines.append(f"{result}: {' '.join(str(number) for number in numbers)}")
+    return "\n".join(lines) + "\n"
+
+def day09(scale: float, rng: Random) -> str:
+    files = scaled(10000, scale)
+    digits = [str(rng.randint(1, 9)) if index % 2 == 0 else str(rng.randint(0, 9)) for index in range(files * 2 - 1)]
+    return "".join(digits) + "\n"
+
+def day10(scale: float, rng: Random) -> str:
+    side = scaled_side(57, scale)
+    # A diagonal slope that climbs by one each step makes trails, and random digits break most of them up:
+    rows = [
+        "".join(str((x + y) % 10) if rng.random() < 0.6 else str(rng.randint(0, 9)) for x in range(side))
+        for y in range(side)
+    ]
+    return "\n".join(rows) + "\n"
+
+def day12(scale: float, rng: Random) -> str:
+    side = scaled_side(140, scale)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    grid: list[list[str]] = []
+    for y in range(side):
+        row: list[str] = []
+        for x in range(side):
+            # Mostly copying a neighbor grows irregular regions from occasional random plants:
+            roll = rng.random()
+            if roll < 0.45 and x > 0:
+                row.append(row[x - 1])
+            elif roll < 0.9 and y > 0:
+                row.append(grid[y - 1][x])
+            else:
+                row.append(rng.choice(letters))
+        grid.append(row)
+    return "".join("".join(row) + "\n" for row in grid)
+
+def day16(scale: float, rng: Random) -> str:
+    side = odd(scaled_side(141, scale))
+    grid = maze(side, side, rng)
+    # Knock out a few walls between corridors, so there are loops and several equally good paths:
+    for _ in range(side * side // 100):
+        x, y = rng.randrange(1, side - 1), rng.randrange(1, side - 1)
+        if (x + y) % 2 == 1:
+            grid[y][x] = "."
+    grid[side - 2][1] = "S"
+    grid[1][side - 2] = "E"
+    return "".join("".join(row) + "\n" for row in grid)
+
+def day18(scale: float, rng: Random) -> str:
+    side = scaled_side(71, scale)
+    cells = [(x, y) for x in range(side) for y in range(side) if (x, y) not in ((0, 0), (side - 1, side - 1))]
+    rng.shuffle(cells)
+    # Filling two thirds of the grid is well past the point where the exit gets cut off:
+    return "".join(f"{x},{y}\n" for x, y in cells[:len(cells) * 2 // 3])
+
+def day18_constructor(scale: float) -> Callable[[], Day]:
+    side = scaled_side(71, scale)
+    day18_base = import_module("day18").Day18Base
+    return cast("Callable[[], Day]", partial(day18_base, side * side // 5, (side - 1, side - 1), None, None, False))
+
+def day20(scale: float, rng: Random) -> str:
+    side = odd(scaled_side(141, scale))
+    grid = maze(side, side, rng)
+    start, end = (1, side - 2), (side - 2, 1)
+
+    # The race track is a single path, so only the maze's path from start to end is kept:
+    parents: dict[tuple[int, int], tuple[int, int] | None] = {start: None}
+    to_visit = [start]
+    while len(to_visit) > 0:
+        x, y = to_visit.pop()
+        for dx, dy in DIRECTIONS:
+            neighbor = (x + dx, y + dy)
+            if grid[neighbor[1]][neighbor[0]] == "." and neighbor not in parents:
+                parents[neighbor] = (x, y)
+                to_visit.append(neighbor)
+
+    track = [["#"] * side for _ in range(side)]
+    current: tuple[int, int] | None = end
+    while current is not None:
+        track[current[1]][current[0]] = "."
+        current = parents[current]
+    track[start[1]][start[0]] = "S"
+    track[end[1]][end[0]] = "E"
+    return "".join("".join(row) + "\n" for row in track)
+
+def day22(scale: float, rng: Random) -> str:
+    return "".join(f"{rng.randint(1, 16777215)}\n" for _ in range(scaled(2000, scale)))
+
+GENERATORS: dict[int, Callable[[float, Random], str]] = {
+    1: day01,
+    2: day02,
+    6: day06,
+    7: day07,
+    9: day09,
+    10: day10,
+    12: day12,
+    16: day16,
+    18: day18,
+    20: day20,
+    22: day22,
+}
+
+# Days whose constructors take size parameters, which have to match the generated input:
+CONSTRUCTORS: dict[int, Callable[[float], Callable[[], Day]]] = {
+    18: day18_constructor,
+}
+
+def generate(day: int, scale: float, seed: int) -> str:
+    return GENERATORS[day](scale, Random(seed))  # noqa: S311
+
+def constructor(day: int, scale: float) -> Callable[[], Day]:
+    """Returns a constructor for the day that suits a generated input of the given scale."""
+    if day in CONSTRUCTORS:
+        return CONSTRUCTORS[day](scale)
+    return cast("Callable[[], Day]", day_class_for(day))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Writes a synthetic input for a day to stdout.")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS), help="the day to generate an input for")
+    parser.add_argument("--scale", type=float, default=1.0, help="size relative to a real input")
+    parser.add_argument("--seed", type=int, default=0, help="random seed, so inputs can be reproduced")
+    args = parser.parse_args()
+    sys.stdout.write(generate(args.day, args.scale, args.seed))
+
+if __name__ == "__main__":
+    main()
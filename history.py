@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import argparse
+import platform
+import sqlite3
+import subprocess
+import sysconfig
+from datetime import UTC, datetime
+from pathlib import Path
+from statistics import median
+
+from util import PhaseResult, columns, parse_days, separator
+
+DEFAULT_DATABASE = Path(".aoc-cache/history.sqlite3")
+# Characters for a sparkline, from the fastest run to the slowest:
+BARS = "▁▂▃▄▅▆▇█"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    git_commit TEXT,
+    python_version TEXT NOT NULL,
+    machine TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    day INTEGER,
+    phase TEXT NOT NULL,
+    duration_ns INTEGER NOT NULL,
+    answer TEXT,
+    passed INTEGER
+);
+CREATE INDEX IF NOT EXISTS timings_by_phase ON timings (day, phase, run_id);
+"""
+
+def connect(database: Path) -> sqlite3.Connection:
+    database.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(database)
+    connection.executescript(SCHEMA)
+    return connection
+
+def git_commit() -> str | None:
+    """The commit being run, with a -dirty suffix if there are uncommitted changes, or None outside a git checkout."""
+    try:
+        described = subprocess.run(
+            ["git", "describe", "--always", "--dirty", "--abbrev=12"],  # noqa: S607
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return described.stdout.strip()
+
+def python_version() -> str:
+    # Free-threaded builds get a "t" suffix, as in their executable's name (python3.13t):
+    return platform.python_version() + ("t" if sysconfig.get_config_var("Py_GIL_DISABLED") else "")
+
+def machine() -> str:
+    return f"{platform.node()} ({platform.machine()})"
+
+def record_run(database: Path, phases: list[PhaseResult], kind: str) -> None:
+    """Stores one run's timings. Phases that were cached weren't measured by this run, and so are left out."""
+    with connect(database) as connection:
+        cursor = connection.execute(
+            "INSERT INTO runs (started_at, kind, git_commit, python_version, machine) VALUES (?, ?, ?, ?, ?)",
+            (datetime.now(UTC).isoformat(timespec="seconds"), kind, git_commit(), python_version(), machine()),
+        )
+        connection.executemany(
+            "INSERT INTO timings (run_id, day, phase, duration_ns, answer, passed) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (cursor.lastrowid, phase.day, phase.phase, phase.duration_ns, phase.answer, phase.passed)
+                for phase in phases
+                if not phase.cached
+            ],
+        )
+    connection.close()
+
+def step_changes(durations: list[int], threshold: float, window: int) -> list[int]:
+    """Finds the runs where a phase got faster or slower and stayed that way: the run, and the median of the runs from
+    there on, both differ from the median of the runs just before by more than `threshold`, while the run just before
+    doesn't. Taking medians means a single noisy run isn't mistaken for a step."""
+    steps: list[int] = []
+    for index in range(1, len(durations)):
+        before = median(durations[max(index - window, 0):index])
+        after = median(durations[index:index + window])
+        if before == 0:
+            continue
+        changed = abs(after / before - 1) > threshold and abs(durations[index] / before - 1) > threshold
+        if changed and abs(durations[index - 1] / before - 1) <= threshold:
+            steps.append(index)
+    return steps
+
+def sparkline(durations: list[int], steps: list[int]) -> str:
+    """Draws each run as a bar scaled between the fastest and slowest, with a | before each step change."""
+    low, high = min(durations), max(durations)
+    line = ""
+    for index, duration in enumerate(durations):
+        if index in steps:
+            line += "|"
+        line += BARS[0] if high == low else BARS[round((duration - low) / (high - low) * (len(BARS) - 1))]
+    return line
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shows how each phase's timing changed over the recorded runs.")
+    parser.add_argument("--database", type=Path, default=DEFAULT_DATABASE, help="history written by all.py --history")
+    parser.add_argument("--days", help="only show these days, like 1-10,17 (default: all)")
+    parser.add_argument("--runs", type=int, default=20, help="how many of the most recent runs to show")
+    parser.add_argument("--kind", choices=("check", "benchmark"), default="check", help="plain runs, or --benchmark medians")
+    parser.add_argument("--threshold", type=float, default=0.2, help="change that counts as a step (0.2 is 20%%)")
+    parser.add_argument("--window", type=int, default=3, help="runs on each side of a step that must agree")
+    parser.add_argument("--all-machines", action="store_true", help="include runs from other machines")
+    args = parser.parse_args()
+    if not args.database.exists():
+        parser.error(f"no history at {args.database}, run all.py --history first")
+
+    connection = connect(args.database)
+    query = "SELECT id, git_commit FROM runs WHERE kind = ?"
+    parameters: list[str | int] = [args.kind]
+    if not args.all_machines:
+        query += " AND machine = ?"
+        parameters.append(machine())
+    query += " ORDER BY id DESC LIMIT ?"
+    parameters.append(args.runs)
+    runs = list(reversed(connection.execute(query, parameters).fetchall()))
+    commits = dict(runs)
+
+    # Durations for each day and phase, in run order. Days that weren't selected in a run have gaps, which are skipped:
+    series: dict[tuple[int | None, str], list[tuple[int, int]]] = {}
+    placeholders = ",".join("?" for _ in runs)
+    for run_id, day, phase, duration_ns in connection.execute(
+        f"SELECT run_id, day, phase, duration_ns FROM timings WHERE run_id IN ({placeholders}) ORDER BY run_id",  # noqa: S608
+        [run_id for run_id, _ in runs],
+    ):
+        series.setdefault((day, phase), []).append((run_id, duration_ns))
+    connection.close()
+
+    selected = None if args.days is None else parse_days(args.days)
+    print(f"{len(runs)} runs, from {commits[runs[0][0]] if runs else '-'} to {commits[runs[-1][0]] if runs else '-'}")
+    print(separator())
+    # Days in order, with the totals (which have no day) last:
+    for (day, phase), points in sorted(series.items(), key=lambda item: (item[0][0] is None, item[0][0] or 0)):
+        if selected is not None and (day is None or day not in selected):
+            continue
+        durations = [duration for _, duration in points]
+        steps = step_changes(durations, args.threshold, args.window)
+        trend = sparkline(durations, steps)
+        if len(steps) > 0:
+            last = steps[-1]
+            before = median(durations[max(last - args.window, 0):last])
+            after = median(durations[last:last + args.window])
+            trend += f" {after / before - 1:+.0%} at {commits[points[last][0]] or '?'}"
+        columns(day, phase, durations[-1] / 1e9, trend[-40:])
+    print(separator())
+
+if __name__ == "__main__":
+    main()
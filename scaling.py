@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+from math import log
+from statistics import linear_regression
+
+from generators import GENERATORS, constructor, generate
+from util import PHASES, columns, construct, parse_days, separator, timed_phases
+
+
+def time_phases(day: int, scale: float, seed: int) -> tuple[int, dict[str, int]]:
+    """Solves a generated input, returning its size in bytes and the nanoseconds each phase took."""
+    text = generate(day, scale, seed)
+    durations, _ = timed_phases(construct(constructor(day, scale), text))
+    return len(text), durations
+
+def growth_exponent(sizes: list[int], durations: list[int]) -> float:
+    """Fits duration = c * size^k on a log-log scale, returning k. Linear code gives about 1, and quadratic about 2."""
+    slope, _ = linear_regression([log(size) for size in sizes], [log(max(duration, 1)) for duration in durations])
+    return slope
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Times days on generated inputs of increasing size.")
+    parser.add_argument("--days", default=",".join(str(day) for day in GENERATORS), help="days to run, like 1-10,17")
+    parser.add_argument("--scales", default="0.25,0.5,1,2", help="input sizes relative to a real input")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the generated inputs")
+    args = parser.parse_args()
+
+    scales = sorted(float(scale) for scale in args.scales.split(","))
+    if len(scales) < 2:
+        parser.error("at least two --scales are needed to estimate growth")
+    days = sorted(parse_days(args.days))
+    missing = [day for day in days if day not in GENERATORS]
+    if len(missing) > 0:
+        parser.error(f"no input generator for day(s) {', '.join(str(day) for day in missing)}")
+
+    print(separator())
+    for day in days:
+        sizes: list[int] = []
+        timings: dict[str, list[int]] = {phase: [] for phase in PHASES}
+        for scale in scales:
+            size, durations = time_phases(day, scale, args.seed)
+            sizes.append(size)
+            for phase in PHASES:
+                timings[phase].append(durations[phase])
+            columns(day, f"Scale {scale:g}", sum(durations.values()) / 1e9, f"{size:,} bytes")
+
+        # The time at the largest scale, along with how quickly it grew to get there:
+        for phase in PHASES:
+            columns(day, phase, timings[phase][-1] / 1e9, f"grows as n^{growth_exponent(sizes, timings[phase]):.2f}")
+    print(separator())
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,162 @@
+from __future__ import annotations
+
+import cProfile
+import heapq
+import os
+import sys
 from abc import ABCMeta, abstractmethod
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import timedelta
+from functools import lru_cache, partial
+from importlib import import_module
+from itertools import count
+from math import ceil
 from pathlib import Path
-from time import time
+from time import perf_counter_ns
+from types import MethodType
+from typing import TYPE_CHECKING, Any, TextIO, cast
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from multiprocessing.connection import Connection
+    from multiprocessing.context import DefaultContext, ForkContext
+
+PHASES = ("Setup", "Part 1", "Part 2")
+# Days to profile (like "6,20"), where to write their .pstats files, and how many functions to list in the table:
+PROFILE_ENV = "AOC_PROFILE"
+PROFILE_DIR_ENV = "AOC_PROFILE_DIR"
+PROFILE_TOP_ENV = "AOC_PROFILE_TOP"
+# When set, every phase is traced with tracemalloc, and the table gains a memory column:
+MEMORY_ENV = "AOC_MEMORY"
+# When set to a directory, each day's parsed state is cached there, keyed by the hashes of its input and source:
+INPUT_CACHE_ENV = "AOC_INPUT_CACHE"
+# When set, days whose parts are independent run both parts at the same time:
+PARALLEL_PARTS_ENV = "AOC_PARALLEL_PARTS"
+# Which kind of pool parallel work runs on: "threads", "processes", or "auto" (threads only if the GIL is disabled):
+BACKEND_ENV = "AOC_BACKEND"
+BACKENDS = ("auto", "threads", "processes")
+# How many workers the data-parallel loops inside a day use. Unset (or 1), the loops run in the calling thread:
+WORKERS_ENV = "AOC_WORKERS"
+# Seconds each part may take before it's stopped, like "10", or "10,14.2=60,22=30" to give Day 14 part 2 and both
+# parts of Day 22 longer. Parts with a budget run in a worker process, which is killed if it goes over:
+BUDGET_ENV = "AOC_BUDGET"
+# The answer recorded for a part that was stopped for going over its budget:
+OVER_BUDGET = "over budget"
+# When set, hot loops count how often they run, and check() prints the counts under each phase:
+COUNTERS_ENV = "AOC_COUNTERS"
+# Text to use in place of the input file, set while solve() constructs a day:
+INPUT_OVERRIDE: ContextVar[str | None] = ContextVar("INPUT_OVERRIDE", default=None)
+# Where table rows are printed, when not to stdout. Being a ContextVar, each thread running a day can capture its own:
+OUTPUT: ContextVar[TextIO | None] = ContextVar("OUTPUT", default=None)
+
+def memory_enabled() -> bool:
+    return os.environ.get(MEMORY_ENV, "") not in ("", "0")
+
+def parallel_parts_enabled() -> bool:
+    return os.environ.get(PARALLEL_PARTS_ENV, "") not in ("", "0")
+
+def counters_enabled() -> bool:
+    return os.environ.get(COUNTERS_ENV, "") not in ("", "0")
+
+class Counters:
+    """Named counts of how often the loops that decide a day's run time ran, which (unlike timings) don't vary from
+    run to run. Counting sites check `enabled` first, so they cost one attribute lookup when counting is off, and sites
+    in the tightest loops count in a local variable and add it once."""
+
+    def __init__(self) -> None:
+        self.enabled = counters_enabled()
+        self.counts: dict[str, int] = {}
+
+    def add(self, name: str, amount: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def take(self) -> dict[str, int]:
+        """Returns the counts so far, and starts counting from zero again."""
+        counts, self.counts = self.counts, {}
+        return counts
+
+counters = Counters()
+
+def gil_disabled() -> bool:
+    """Whether this is a free-threaded build running without the GIL, where threads can run Python code in parallel."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+def backend() -> str:
+    name = os.environ.get(BACKEND_ENV, "") or "auto"
+    if name not in BACKENDS:
+        msg = f"Unknown backend '{name}', expected one of {', '.join(BACKENDS)}"
+        raise ValueError(msg)
+    if name == "auto":
+        return "threads" if gil_disabled() else "processes"
+    return name
+
+def worker_context() -> DefaultContext | ForkContext:
+    """How worker processes are started: forked where that's safe, so they inherit what's already been set up (like a
+    parsed day) rather than having it pickled, which can take longer than the work itself. macOS can fork, but its
+    system libraries may crash in a forked child, so it (like Windows) keeps its default of spawning."""
+    import multiprocessing  # noqa: PLC0415
 
+    if sys.platform == "darwin" or "fork" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context()
+    return multiprocessing.get_context("fork")
+
+def make_executor(
+        max_workers: int | None = None,
+        initializer: Callable[..., object] | None = None,
+        initargs: tuple[Any, ...] = (),
+) -> Executor:
+    """A pool on the configured backend, calling `initializer(*initargs)` in each worker as it starts. Threads avoid
+    starting processes and pickling arguments and results, but only run in parallel on a free-threaded build."""
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor  # noqa: PLC0415
+
+    if backend() == "threads":
+        return ThreadPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs)
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=worker_context(), initializer=initializer, initargs=initargs)
+
+def workers() -> int:
+    return max(int(os.environ.get(WORKERS_ENV, "") or 1), 1)
+
+# The shared arguments of the parallel_map a worker process is part of:
+map_shared: tuple[Any, ...] = ()
+
+def init_map_worker(shared: tuple[Any, ...]) -> None:
+    global map_shared
+    map_shared = shared
+
+def call_with_shared[Mapped](function: Callable[..., Mapped], item: object) -> Mapped:
+    return function(*map_shared, item)
+
+def parallel_map[Item, Mapped](
+        function: Callable[..., Mapped],
+        items: Sequence[Item],
+        shared: tuple[Any, ...] = (),
+) -> list[Mapped]:
+    """Maps a function over items, spread across the configured number of workers, calling it with the `shared`
+    arguments before each item. The function must be pure (and, for the processes backend, picklable along with the
+    items), since it may run in other threads or processes. Processes are given the shared arguments once, as they
+    start, so large ones (like a grid) aren't pickled again with every chunk of items."""
+    worker_count = workers()
+    # Counts made in other processes would be lost, so counting runs everything here:
+    if worker_count <= 1 or len(items) <= 1 or counters.enabled:
+        return [function(*shared, item) for item in items]
+    if backend() == "threads":
+        with make_executor(worker_count) as executor:
+            return list(executor.map(partial(function, *shared), items))
+    with make_executor(worker_count, initializer=init_map_worker, initargs=(shared,)) as executor:
+        # Each process gets a few large chunks rather than many small ones, so pickling doesn't dominate:
+        chunksize = max(len(items) // (worker_count * 4), 1)
+        return list(executor.map(partial(call_with_shared, function), items, chunksize=chunksize))
+
+def memory_format(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
 
 def time_diff_format(seconds: float) -> str:
     delta = timedelta(seconds=seconds)
@@ -12,11 +166,372 @@ def time_diff_format(seconds: float) -> str:
         return f"{delta.microseconds / 1000}ms"
     return f"{delta.microseconds}μs"
 
-def columns(day: int | None, label: str, time_diff: float, value: str) -> None:
+def columns(day: int | None, label: str, time_diff: float | None, value: str, memory: str = "") -> None:
     day_str = "All   " if day is None else f"Day {day:2}"
-    print(f"| {day_str} | {label:10} | {time_diff_format(time_diff):15} | {value:40} |")
+    time_str = "" if time_diff is None else time_diff_format(time_diff)
+    row = f"| {day_str} | {label:10} | {time_str:15} | {value:40} |"
+    if memory_enabled():
+        row += f" {memory:24} |"
+    print(row, file=OUTPUT.get() or sys.stdout)
+
+def separator() -> str:
+    line = "+--------+------------+-----------------+------------------------------------------+"
+    if memory_enabled():
+        line += "--------------------------+"
+    return line
+
+def parse_days(spec: str) -> set[int]:
+    """Parses a selection of days like "1-10,17" into day numbers."""
+    days: set[int] = set()
+    for part in spec.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            days.update(range(int(first), int(last) + 1))
+        elif part.strip():
+            days.add(int(part))
+    return days
+
+def parse_budgets(spec: str) -> dict[str, float]:
+    """Parses budgets like "10,14.2=60,22=30" into seconds keyed by "" (the default), "14.2" (a day's part) or "22" (both
+    of a day's parts)."""
+    budgets: dict[str, float] = {}
+    for part in spec.split(","):
+        if "=" in part:
+            key, seconds = part.split("=")
+            budgets[key.strip()] = float(seconds)
+        elif part.strip():
+            budgets[""] = float(part)
+    return budgets
+
+def budget_for(day: int, part: int) -> float | None:
+    budgets = parse_budgets(os.environ.get(BUDGET_ENV, ""))
+    return budgets.get(f"{day}.{part}", budgets.get(str(day), budgets.get("")))
+
+def function_label(function: tuple[str, int, str]) -> str:
+    filename, line, name = function
+    if filename == "~":
+        return name
+    return f"{Path(filename).name}:{line}({name})"
+
+def summarize(samples_ns: list[int]) -> dict[str, float]:
+    """Summarizes repeated timings of a single phase. The p95 uses the nearest-rank method."""
+    from statistics import median, stdev  # noqa: PLC0415
+
+    ordered = sorted(samples_ns)
+    return {
+        "runs": len(ordered),
+        "min_ns": ordered[0],
+        "median_ns": median(ordered),
+        "p95_ns": ordered[ceil(len(ordered) * 0.95) - 1],
+        "stddev_ns": stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+def find_regressions(
+        baseline: dict[str, dict[str, float]],
+        current: dict[str, dict[str, float]],
+        threshold: float,
+        noise_floor_ns: float,
+) -> list[tuple[int, str, float, float]]:
+    """Compares per-day, per-phase durations (in nanoseconds) against a baseline, returning (day, phase, baseline,
+    current) for every phase that got slower by more than `threshold` (a fraction, so 0.1 is 10%). Slowdowns smaller
+    than `noise_floor_ns` are ignored, since microsecond phases jitter by far more than 10% between runs."""
+    regressions: list[tuple[int, str, float, float]] = []
+    for day, phases in current.items():
+        for phase, duration in phases.items():
+            baseline_duration = baseline.get(day, {}).get(phase)
+            if baseline_duration is None:
+                continue
+            if duration - baseline_duration > max(baseline_duration * threshold, noise_floor_ns):
+                regressions.append((int(day), phase, baseline_duration, duration))
+    return regressions
+
+def check_characters(lines: list[str], known: Iterable[str]) -> None:
+    """Raises ValueError if the lines contain a character that isn't known, which Grid.from_lines would otherwise
+    quietly store as its fill value."""
+    unknown = set("".join(lines)) - set(known)
+    if len(unknown) > 0:
+        msg = f"Unknown character(s) '{''.join(sorted(unknown))}'"
+        raise ValueError(msg)
+
+class Grid:
+    """A grid of single-byte cells, stored row by row in one flat bytearray and addressed by index rather than by
+    (x, y) tuple. The grid is surrounded by `border_width` cells of `border` on every side, so probing a neighbor (or
+    anything up to `border_width` cells away) never needs a bounds check: it just finds a border cell."""
+
+    def __init__(self, width: int, height: int, fill: int = 0, border: int = 255, border_width: int = 1) -> None:
+        self.width = width
+        self.height = height
+        self.border = border
+        self.border_width = border_width
+        self.stride = width + border_width * 2
+        self.cells = bytearray([border]) * (self.stride * (height + border_width * 2))
+        row = bytes([fill]) * width
+        for y in range(height):
+            start = self.index(0, y)
+            self.cells[start:start + width] = row
+        # The offsets to the cells above, right, below and left. They're clockwise, so turning right adds 1:
+        self.offsets = (-self.stride, 1, self.stride, -1)
+
+    @classmethod
+    def from_lines(
+            cls,
+            lines: list[str],
+            values: Mapping[str, int] | None = None,
+            fill: int = 0,
+            border: int = 255,
+            border_width: int = 1,
+    ) -> Grid:
+        """Builds a grid from lines of text. Each character is stored as `values[char]` (or `fill` if it's missing),
+        or as its ASCII code if no values are given."""
+        grid = cls(len(lines[0]), len(lines), fill, border, border_width)
+        table = None
+        if values is not None:
+            translation = bytearray([fill]) * 256
+            for char, value in values.items():
+                translation[ord(char)] = value
+            table = bytes(translation)
+        for y, line in enumerate(lines):
+            start = grid.index(0, y)
+            grid.cells[start:start + grid.width] = line.encode() if table is None else line.encode().translate(table)
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.border_width) * self.stride + x + self.border_width
+
+    def point(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - self.border_width, y - self.border_width
+
+    def offset(self, dx: int, dy: int) -> int:
+        return dy * self.stride + dx
+
+    def contains(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def distance(self, a: int, b: int) -> int:
+        """The Manhattan distance between two cells."""
+        a_y, a_x = divmod(a, self.stride)
+        b_y, b_x = divmod(b, self.stride)
+        return abs(a_x - b_x) + abs(a_y - b_y)
+
+    def indexes(self) -> Iterator[int]:
+        """Every index inside the border, row by row."""
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def find(self, value: int) -> Iterator[int]:
+        return (index for index in self.indexes() if self.cells[index] == value)
+
+    def copy(self) -> Grid:
+        grid = Grid.__new__(Grid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = bytearray(self.cells)
+        return grid
+
+@dataclass
+class SearchResult[Node: Hashable]:
+    # The shortest distance to every node the search settled:
+    distances: dict[Node, int]
+    # Every node that precedes each node on one of its shortest paths, if the search tracked them:
+    predecessors: dict[Node, list[Node]] = field(default_factory=dict)
+    # The goal node the search stopped at, if it found one:
+    goal: Node | None = None
+
+    def path_nodes(self, ends: Iterable[Node]) -> set[Node]:
+        """Every node on any shortest path to any of `ends`, following the tracked predecessors back to the start."""
+        nodes = set(ends)
+        to_visit = list(nodes)
+        while len(to_visit) > 0:
+            for predecessor in self.predecessors.get(to_visit.pop(), ()):
+                if predecessor not in nodes:
+                    nodes.add(predecessor)
+                    to_visit.append(predecessor)
+        return nodes
+
+def dijkstra[Node: Hashable](
+        starts: Iterable[Node],
+        neighbors: Callable[[Node], Iterable[tuple[Node, int]]],
+        goal: Callable[[Node], bool] | None = None,
+        track_predecessors: bool = False,
+) -> SearchResult[Node]:
+    """Finds the shortest distance from any of `starts` to every reachable node, where `neighbors` yields each node's
+    neighbors and the non-negative cost of moving to them. If `goal` is given, the search stops as soon as it settles a
+    node matching it, leaving the distances of anything further away unsettled."""
+    result: SearchResult[Node] = SearchResult({})
+    best: dict[Node, int] = {}
+    # The counter breaks ties between equal costs, so nodes themselves never need to be comparable:
+    order = count()
+    to_visit: list[tuple[int, int, Node]] = []
+    for start in starts:
+        best[start] = 0
+        heapq.heappush(to_visit, (0, next(order), start))
+
+    while len(to_visit) > 0:
+        cost, _, node = heapq.heappop(to_visit)
+        if node in result.distances or cost > best[node]:
+            continue
+        result.distances[node] = cost
+        if goal is not None and goal(node):
+            result.goal = node
+            break
+
+        for neighbor, step in neighbors(node):
+            new_cost = cost + step
+            existing = best.get(neighbor)
+            if existing is None or new_cost < existing:
+                best[neighbor] = new_cost
+                heapq.heappush(to_visit, (new_cost, next(order), neighbor))
+                if track_predecessors:
+                    result.predecessors[neighbor] = [node]
+            elif track_predecessors and new_cost == existing:
+                result.predecessors[neighbor].append(node)
+
+    if counters.enabled:
+        # Every push took a number from the tiebreak counter:
+        counters.add("dijkstra heap pushes", next(order))
+    return result
+
+def bfs[Node: Hashable](
+        starts: Iterable[Node],
+        neighbors: Callable[[Node], Iterable[Node]],
+        goal: Callable[[Node], bool] | None = None,
+        track_predecessors: bool = False,
+) -> SearchResult[Node]:
+    """Like dijkstra(), for when every step costs 1, so a plain queue visits nodes in order of distance."""
+    result: SearchResult[Node] = SearchResult({})
+    distances = result.distances
+    for start in starts:
+        distances[start] = 0
+    to_visit = deque(distances)
+
+    while len(to_visit) > 0:
+        node = to_visit.popleft()
+        if goal is not None and goal(node):
+            result.goal = node
+            break
+
+        cost = distances[node] + 1
+        for neighbor in neighbors(node):
+            existing = distances.get(neighbor)
+            if existing is None:
+                distances[neighbor] = cost
+                to_visit.append(neighbor)
+                if track_predecessors:
+                    result.predecessors[neighbor] = [node]
+            elif track_predecessors and existing == cost:
+                result.predecessors[neighbor].append(node)
+
+    if counters.enabled:
+        # Every node with a distance was queued exactly once:
+        counters.add("bfs queue pushes", len(distances))
+    return result
+
+class MemoizedMethod[Value]:
+    """A method whose results are remembered separately for each instance, by an lru_cache that's created the first
+    time the method is looked up on the instance, and goes away along with it. The cache replaces the method on the
+    instance, so later calls skip this descriptor entirely, and `instance.method.cache_info()` (hits, misses and size)
+    and `instance.method.cache_clear()` work as they do for functools.lru_cache."""
+
+    def __init__(self, function: Callable[..., Value], maxsize: int | None) -> None:
+        self.function = function
+        self.maxsize = maxsize
+        self.name = function.__name__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: object | None, owner: type | None = None) -> Callable[..., Value]:
+        if instance is None:
+            return self.function
+        memo = lru_cache(maxsize=self.maxsize)(MethodType(self.function, instance))
+        instance.__dict__[self.name] = memo
+        return memo
+
+def memoized[Value](maxsize: int | None = None) -> Callable[[Callable[..., Value]], MemoizedMethod[Value]]:
+    """Memoizes a method per instance, like functools.cache, but without keeping every instance it was called on alive,
+    and (with `maxsize`) keeping only the most recently used results."""
+    return partial(MemoizedMethod, maxsize=maxsize)
+
+def memos(instance: object) -> dict[str, Any]:
+    """The caches of the memoized methods an instance has called so far, by name."""
+    return {
+        name: vars(instance)[name]
+        for owner in type(instance).__mro__
+        for name, attribute in vars(owner).items()
+        if isinstance(attribute, MemoizedMethod) and name in vars(instance)
+    }
+
+def input_path_for(day: int, example: bool = False) -> Path:
+    return Path(__file__).parent / "inputs" / (f"day{day:02}.example.txt" if example else f"day{day:02}.txt")
+
+@dataclass
+class PhaseResult:
+    day: int | None
+    phase: str
+    duration_ns: int
+    answer: str | None = None
+    # Whether the answer matched the expected one, or None if there was nothing to check:
+    passed: bool | None = None
+    # Whether the phase was skipped in favor of an earlier run's result (or for setup, an earlier run's parsed input):
+    cached: bool = False
+    # The phase's peak traced bytes and net change in allocated blocks, when memory tracing is enabled:
+    memory_peak: int | None = None
+    memory_blocks: int | None = None
+    # How often the day's hot loops ran, when counting is enabled:
+    counts: dict[str, int] = field(default_factory=dict)
+
+# A part's result, how many nanoseconds it took, and what its hot loops counted:
+PartOutcome = tuple[str | int | None, int, dict[str, int]]
+
+def timed_part(instance: Day, part: str) -> PartOutcome:
+    """Runs part "part1" or "part2" of a day, returning its result, how long it took and its counts."""
+    counters.take()
+    before = {name: memo.cache_info() for name, memo in memos(instance).items()} if counters.enabled else {}
+    start = perf_counter_ns()
+    result = getattr(instance, part)()
+    duration = perf_counter_ns() - start
+    if counters.enabled:
+        # Memos keep their own hit and miss counts, so only the part's share of them is added:
+        for name, memo in memos(instance).items():
+            info = memo.cache_info()
+            hits, misses = (before[name].hits, before[name].misses) if name in before else (0, 0)
+            if (info.hits, info.misses) != (hits, misses):
+                counters.add(f"{name} hits", info.hits - hits)
+                counters.add(f"{name} misses", info.misses - misses)
+    return result, duration, counters.take()
+
+def timed_phases(instance: Day) -> tuple[dict[str, int], dict[str, str | int | None]]:
+    """Runs both parts of a day that was just constructed, returning how long each phase took and each part's result."""
+    durations = {"Setup": perf_counter_ns() - instance.setup_start}
+    results: dict[str, str | int | None] = {}
+    for part, phase in (("part1", "Part 1"), ("part2", "Part 2")):
+        results[phase], durations[phase], _ = timed_part(instance, part)
+    return durations, results
+
+# The day whose parts a --parallel-parts worker process runs:
+part_instance: Day | None = None
+
+def init_part_worker(instance: Day) -> None:
+    global part_instance
+    part_instance = instance
+
+def run_part(part: str) -> PartOutcome:
+    assert part_instance is not None
+    return timed_part(part_instance, part)
+
+def run_supervised_part(connection: Connection, instance: Day, part: str) -> None:
+    """Runs one part in a supervised worker process, sending back its result and duration, or the exception it raised."""
+    try:
+        connection.send((True, timed_part(instance, part)))
+    except Exception as e:  # noqa: BLE001
+        connection.send((False, e))
 
 class Day(metaclass=ABCMeta):
+    # Days set this when neither part depends on (or changes) anything the other part changes, so check() may run both
+    # parts at the same time:
+    parts_independent = False
+
     def __init__(
             self,
             day: int,
@@ -28,41 +543,338 @@ class Day(metaclass=ABCMeta):
         self.part1_expect = part1_expect
         self.part2_expect = part2_expect
 
-        day_str: str = str(day)
-        if len(day_str) == 1:
-            day_str = "0" + day_str
-        filename = "day" + day_str + ".example.txt" if example else "day" + day_str + ".txt"
-        self.text = (Path(__file__).parent / "inputs" / filename).read_text()
+        self.input_path = input_path_for(day, example)
+        override = INPUT_OVERRIDE.get()
+        self.text = self.input_path.read_text() if override is None else override
         self.lines = self.text.splitlines()
-        self.setup_start = time()
+        self.start_setup()
+
+    def start_setup(self) -> None:
+        """Resets the harness's bookkeeping, and starts timing (and, if enabled, profiling and tracing) setup."""
+        self.durations: dict[str, int] = {}
+        # The answer for each part that check() has run:
+        self.results: dict[str, str] = {}
+        self.profiler = cProfile.Profile() if self.day in parse_days(os.environ.get(PROFILE_ENV, "")) else None
+        # Peak traced bytes and the net change in allocated blocks for each phase, when memory tracing is enabled:
+        self.memory: dict[str, tuple[int, int]] = {}
+        self.blocks_start = 0
+        self.setup_cached = False
+        counters.enabled = counters_enabled()
+        counters.take()
+        self.memory_start()
+        self.setup_start = perf_counter_ns()
+        if self.profiler is not None:
+            self.profiler.enable()
 
     @abstractmethod
     def part1(self) -> str | int | None: pass
     @abstractmethod
     def part2(self) -> str | int | None: pass
 
-    def check(self) -> None:
-        setup_duration = time() - self.setup_start
-        columns(self.day, "Setup", setup_duration, "")
-
-        part1_start = time()
-        part1_result = self.part1()
-        part1_duration = time() - part1_start
-        columns(self.day, "Part 1", part1_duration, str(part1_result))
-        if part1_result is None:
-            return
-        if self.part1_expect is not None and part1_result != self.part1_expect:
-            msg = f"For Part 1, expected {self.part1_expect} but got {part1_result}"
+    @staticmethod
+    def verify(label: str, result: str | int | None, expect: str | int | None) -> None:
+        if expect is not None and result != expect:
+            msg = f"For {label}, expected {expect} but got {result}"
             raise ValueError(msg)
 
-        part2_start = time()
-        part2_result = self.part2()
-        part2_duration = time() - part2_start
-        columns(self.day, "Part 2", part2_duration, str(part2_result))
-        if part2_result is None:
-            return
-        if self.part2_expect is not None and part2_result != self.part2_expect:
-            msg = f"For Part 2, expected {self.part2_expect} but got {part2_result}"
-            raise ValueError(msg)
+    def profile_start(self) -> None:
+        if self.profiler is not None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    @staticmethod
+    def is_harness_function(function: tuple[str, int, str]) -> bool:
+        """Whether a profiled function is part of the timing harness, rather than the solution being profiled."""
+        filename, _, name = function
+        if filename == __file__:
+            return name in ("check", "profile_stop", "run_phase", "timed_part")
+        return "_lsprof.Profiler" in name or "perf_counter_ns" in name
+
+    def profile_stop(self) -> None:
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def profile_report(self, phase: str) -> list[tuple[float, str]]:
+        """Dumps the profile of the phase that just finished to a .pstats file, returning the functions with the most
+        cumulative time (to be listed underneath that phase's row)."""
+        if self.profiler is None:
+            return []
+
+        directory = Path(os.environ.get(PROFILE_DIR_ENV, "profiles"))
+        directory.mkdir(parents=True, exist_ok=True)
+        self.profiler.dump_stats(directory / f"day{self.day:02}.{phase.lower().replace(' ', '')}.pstats")
+
+        # Modules only some runs need, like pstats here, are imported where they're used to keep startup fast:
+        import pstats  # noqa: PLC0415
+
+        top = int(os.environ.get(PROFILE_TOP_ENV, "5"))
+        stats = pstats.Stats(self.profiler).stats  # type: ignore[attr-defined]
+        functions = sorted(
+            ((cumulative, function) for function, (_, _, _, cumulative, _) in stats.items()
+             if not self.is_harness_function(function)),
+            reverse=True,
+        )
+        return [(cumulative, function_label(function)) for cumulative, function in functions[:top]]
+
+    def print_profile(self, phase: str, functions: list[tuple[float, str]]) -> None:
+        for cumulative, label in functions:
+            columns(self.day, f"{phase} cum", cumulative, label[-40:])
+
+    def memory_start(self) -> None:
+        """Traces allocations from scratch, so each phase's peak only counts memory allocated during that phase."""
+        if memory_enabled():
+            import tracemalloc  # noqa: PLC0415
+
+            tracemalloc.start()
+            self.blocks_start = sys.getallocatedblocks()
+
+    def memory_stop(self, phase: str) -> str:
+        if not memory_enabled():
+            return ""
+        import tracemalloc  # noqa: PLC0415
+
+        if not tracemalloc.is_tracing():
+            return ""
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        blocks = sys.getallocatedblocks() - self.blocks_start
+        self.memory[phase] = (peak, blocks)
+        return f"peak {memory_format(peak)} {blocks:+,} blk"
+
+    def run_parts_in_parallel(self) -> list[PartOutcome] | None:
+        """Runs both parts at the same time on the configured backend, returning each one's result and duration. Returns
+        None (so the parts run one after the other as usual) unless the day's parts are independent and parallel parts
+        are enabled. The parts also run as usual if the day is being profiled or traced (since that only sees the
+        calling thread), or if there's only one CPU to run them on."""
+        if not self.parts_independent or not parallel_parts_enabled() or (os.cpu_count() or 1) < 2:
+            return None
+        # Parts with a budget each run in their own supervised worker instead:
+        if os.environ.get(BUDGET_ENV):
+            return None
+        if self.profiler is not None or memory_enabled():
+            return None
+        if backend() == "threads":
+            # Threads share the counters, so each part's counts couldn't be told apart:
+            if counters.enabled:
+                return None
+            with make_executor(2) as executor:
+                futures = [executor.submit(timed_part, self, part) for part in ("part1", "part2")]
+                return [future.result() for future in futures]
+        with make_executor(2, initializer=init_part_worker, initargs=(self,)) as executor:
+            futures = [executor.submit(run_part, part) for part in ("part1", "part2")]
+            return [future.result() for future in futures]
+
+    def run_supervised(self, part: str, budget: float) -> PartOutcome | None:
+        """Runs a part in a worker process, returning its result and duration, or None if it was killed for taking
+        longer than `budget` seconds."""
+        context = worker_context()
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=run_supervised_part, args=(sender, self, part))
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(budget):
+                return None
+            succeeded, outcome = receiver.recv()
+        except EOFError:
+            msg = f"The worker running {part} exited with code {process.exitcode} before finishing"
+            raise RuntimeError(msg) from None
+        finally:
+            process.kill()
+            process.join()
+            receiver.close()
+        if not succeeded:
+            raise outcome
+        return cast("PartOutcome", outcome)
+
+    def run_phase(
+            self,
+            part: str,
+            parallel: list[PartOutcome] | None,
+    ) -> PartOutcome | None:
+        """Runs part "part1" or "part2" (unless it already ran in parallel), returning its result and duration, or None
+        if it went over its budget. Parts being profiled or traced run in this process, and so have no budget."""
+        if parallel is not None:
+            return parallel[0 if part == "part1" else 1]
+        if self.profiler is not None or memory_enabled():
+            return timed_part(self, part)
+        budget = budget_for(self.day, 1 if part == "part1" else 2)
+        if budget is None:
+            return timed_part(self, part)
+        return self.run_supervised(part, budget)
+
+    def report_over_budget(self, phase: str) -> PhaseResult:
+        budget = budget_for(self.day, 1 if phase == "Part 1" else 2) or 0
+        self.durations[phase] = int(budget * 1e9)
+        self.results[phase] = OVER_BUDGET
+        columns(self.day, phase, budget, f"{OVER_BUDGET}, stopped after {budget:g}s")
+        return PhaseResult(self.day, phase, self.durations[phase], OVER_BUDGET, passed=False)
+
+    def phase_result(
+            self,
+            phase: str,
+            answer: str | None = None,
+            passed: bool | None = None,
+            counts: dict[str, int] | None = None,
+    ) -> PhaseResult:
+        peak, blocks = self.memory.get(phase, (None, None))
+        cached = phase == "Setup" and self.setup_cached
+        return PhaseResult(self.day, phase, self.durations[phase], answer, passed, cached, peak, blocks, counts or {})
+
+    def print_counts(self, phase: str, counts: dict[str, int]) -> None:
+        for name, total in sorted(counts.items()):
+            columns(self.day, f"{phase} #", None, f"{total:,} {name}")
+
+    def check(self, strict: bool = True) -> list[PhaseResult]:
+        """Runs both parts, printing a row for each phase, and returns each phase's result. A wrong answer raises
+        ValueError, unless `strict` is off, in which case it's only reported as failing."""
+        setup_duration = perf_counter_ns() - self.setup_start
+        self.durations["Setup"] = setup_duration
+        self.profile_stop()
+        memory = self.memory_stop("Setup")
+        profile = self.profile_report("Setup")
+        counts = counters.take()
+        columns(self.day, "Setup", setup_duration / 1e9, "cached" if self.setup_cached else "", memory)
+        self.print_counts("Setup", counts)
+        self.print_profile("Setup", profile)
+        phases = [self.phase_result("Setup", counts=counts)]
+
+        parallel = self.run_parts_in_parallel()
+
+        for part, phase, expect in (("part1", "Part 1", self.part1_expect), ("part2", "Part 2", self.part2_expect)):
+            self.memory_start()
+            self.profile_start()
+            outcome = self.run_phase(part, parallel)
+            if outcome is None:
+                phases.append(self.report_over_budget(phase))
+                return phases
+            result, duration, counts = outcome
+            self.durations[phase] = duration
+            self.results[phase] = str(result)
+            self.profile_stop()
+            memory = self.memory_stop(phase)
+            profile = self.profile_report(phase)
+            passed = None if result is None or expect is None else result == expect
+            columns(self.day, phase, duration / 1e9, str(result) if passed is not False else f"{result}, expected {expect}", memory)
+            self.print_counts(phase, counts)
+            self.print_profile(phase, profile)
+            phases.append(self.phase_result(phase, None if result is None else str(result), passed, counts))
+            if result is None:
+                return phases
+            if strict:
+                self.verify(phase, result, expect)
+
+        columns(self.day, "Total", sum(self.durations.values()) / 1e9, "")
+        return phases
+
+def benchmark(factory: Callable[[], Day], repeats: int, warmup: int = 1) -> dict[str, dict[str, float]]:
+    """Times setup, part 1 and part 2 `repeats` times after `warmup` discarded runs. Every run uses a fresh instance,
+    because some parts (like Day 9 and Day 13 part 2) mutate their parsed input."""
+    samples: dict[str, list[int]] = {phase: [] for phase in PHASES}
+
+    for run in range(warmup + repeats):
+        instance = factory()
+        durations, results = timed_phases(instance)
+        instance.verify("Part 1", results["Part 1"], instance.part1_expect)
+        instance.verify("Part 2", results["Part 2"], instance.part2_expect)
+
+        if run >= warmup:
+            for phase in PHASES:
+                samples[phase].append(durations[phase])
+
+    return {phase: summarize(phase_samples) for phase, phase_samples in samples.items()}
+
+# Day 24 was partially manually solved, and so is skipped unless it's selected explicitly.
+SKIPPED_DAYS = {24}
+
+def available_days() -> list[int]:
+    """Finds the dayNN.py modules next to this file, without importing any of them."""
+    return sorted(int(path.stem[3:]) for path in Path(__file__).parent.glob("day[0-9][0-9].py"))
+
+# Attributes that belong to the harness rather than to a day's parsed input, and so are never cached:
+HARNESS_ATTRIBUTES = {"durations", "results", "profiler", "memory", "blocks_start", "setup_cached", "setup_start"}
+
+def files_hash(paths: Iterable[Path]) -> str:
+    import hashlib  # noqa: PLC0415
+
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+def parsed_cache_key(day_class: type[Day], input_path: Path) -> str:
+    """Parsed state is only reusable if the input, the day's module, and this harness are all unchanged."""
+    return files_hash((input_path, Path(sys.modules[day_class.__module__].__file__ or ""), Path(__file__)))
+
+def result_cache_key(day: int) -> str | None:
+    """A day's answers are only reusable if its module, this harness and its input are all unchanged. Returns None if
+    any of them is missing, so the day runs (and reports the problem) as usual."""
+    paths = (Path(__file__).parent / f"day{day:02}.py", Path(__file__), input_path_for(day))
+    if not all(path.exists() for path in paths):
+        return None
+    return files_hash(paths)
+
+def load_parsed(day_class: type[Day], directory: Path) -> Day:
+    """Constructs a day, reusing the state its __init__ produced on an earlier run when nothing it depends on has
+    changed. The cache file starts with the day, input path and key, so a stale entry is detected without unpickling the
+    (potentially huge) state that follows."""
+    import pickle  # noqa: PLC0415
+
+    cache_path = directory / f"{day_class.__module__}.{day_class.__qualname__}.pickle"
+    if cache_path.exists():
+        with cache_path.open("rb") as file:
+            day, input_path, key = pickle.load(file)  # noqa: S301
+            instance = day_class.__new__(day_class)
+            instance.day = day
+            instance.start_setup()
+            if Path(input_path).exists() and key == parsed_cache_key(day_class, Path(input_path)):
+                instance.__dict__.update(pickle.load(file))  # noqa: S301
+                instance.setup_cached = True
+                return instance
+            instance.profile_stop()
+            instance.memory_stop("Setup")
+
+    instance = cast("Callable[[], Day]", day_class)()
+    # Writing the cache isn't part of setup, so it's left out of the setup timing:
+    save_start = perf_counter_ns()
+    state = {name: value for name, value in vars(instance).items() if name not in HARNESS_ATTRIBUTES}
+    directory.mkdir(parents=True, exist_ok=True)
+    with cache_path.open("wb") as file:
+        pickle.dump((instance.day, str(instance.input_path), parsed_cache_key(day_class, instance.input_path)), file)
+        pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+    instance.setup_start += perf_counter_ns() - save_start
+    return instance
+
+def day_class_for(day: int, example: bool = False) -> type[Day]:
+    """Imports only the module for the given day, returning its class for the real (or example) input."""
+    module = import_module(f"day{day:02}")
+    day_class: type[Day] = getattr(module, f"Day{day:02}Example" if example else f"Day{day:02}")
+    return day_class
+
+def load_day(day: int) -> Callable[[], Day]:
+    """Returns a constructor for the given day's real input. When the input cache is enabled, the constructor reuses
+    previously parsed state."""
+    day_class = day_class_for(day)
+    cache_directory = os.environ.get(INPUT_CACHE_ENV)
+    if cache_directory:
+        return partial(load_parsed, day_class, Path(cache_directory))
+    return cast("Callable[[], Day]", day_class)
+
+def construct(factory: Callable[[], Day], text: str | bytes) -> Day:
+    """Constructs a day from the given input, without touching the inputs directory. `factory` is a day class, or
+    anything else that constructs one (like a generators.constructor for a generated input's size)."""
+    token = INPUT_OVERRIDE.set(text.decode() if isinstance(text, bytes) else text)
+    try:
+        instance = factory()
+    finally:
+        INPUT_OVERRIDE.reset(token)
+    instance.profile_stop()
+    instance.memory_stop("Setup")
+    return instance
 
-        columns(self.day, "Total", setup_duration + part1_duration + part2_duration, "")
+def solve(day: int, text: str | bytes, example: bool = False) -> tuple[str | int | None, str | int | None]:
+    """Solves both parts of a day for the given input. Answers aren't checked against the expected values, since those
+    only hold for the real input. Pass `example` to use the day's example class, for days whose parameters (like Day
+    18's grid size) differ between the example and the real input."""
+    instance = construct(cast("Callable[[], Day]", day_class_for(day, example)), text)
+    return instance.part1(), instance.part2()